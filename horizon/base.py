@@ -22,6 +22,7 @@ the classes contained therein.
 
 import collections
 import copy
+import hashlib
 import inspect
 import logging
 import os
@@ -58,20 +59,50 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
             _decorate_urlconf(pattern.url_patterns, decorator, *args, **kwargs)
 
 
+def _get_allowed(request):
+    """Returns the cache key and the access decisions made for a token.
+
+    The decisions are kept in the shared cache under a fingerprint of the
+    token, the session only holds that fingerprint. Without a token, or
+    with the ``horizon.allowed`` cache disabled in ``MEMOIZED_TTL``, they
+    only last for the request.
+    """
+    try:
+        return request._horizon_allowed
+    except AttributeError:
+        pass
+    # Imported here as horizon.base is imported while the settings, which
+    # configure the cache, are still loading.
+    from django.core.cache import cache
+    from horizon.utils import memoized
+
+    session = request.session
+    token = session.get('token')
+    cache_key = None
+    allowed = None
+    timeout = memoized.get_ttl('horizon.allowed', 3600)
+    if token is not None and timeout:
+        token_id = getattr(token, 'id', token)
+        fingerprint = hashlib.md5(
+            six.text_type(token_id).encode('utf-8')).hexdigest()[:16]
+        if session.get('allowed') != fingerprint:
+            session['allowed'] = fingerprint
+        cache_key = 'horizon.allowed:%s' % fingerprint
+        allowed = cache.get(cache_key)
+    request._horizon_allowed = (cache_key, allowed or {}, timeout)
+    return request._horizon_allowed
+
+
 def access_cached(func):
     def inner(self, context):
-        session = context['request'].session
-        try:
-            if session['allowed']['valid_for'] != session.get('token'):
-                raise KeyError()
-        except KeyError:
-            session['allowed'] = {"valid_for": session.get('token')}
-
+        cache_key, allowed, timeout = _get_allowed(context['request'])
         key = "%s.%s" % (self.__class__.__module__, self.__class__.__name__)
-        if key not in session['allowed']:
-            session['allowed'][key] = func(self, context)
-            session.modified = True
-        return session['allowed'][key]
+        if key not in allowed:
+            allowed[key] = func(self, context)
+            if cache_key is not None:
+                from django.core.cache import cache
+                cache.set(cache_key, allowed, timeout)
+        return allowed[key]
     return inner
 
 
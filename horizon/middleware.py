@@ -70,7 +70,10 @@ class HorizonMiddleware(object):
             # The user was logged in, but his keystone token expired.
             has_timed_out = True
         if isinstance(last_activity, int):
-            if (timestamp - last_activity) > timeout:
+            # last_activity is only updated when it moves by more than the
+            # granularity, the actual last activity may be that much later.
+            granularity = getattr(settings, 'SESSION_ACTIVITY_GRANULARITY', 0)
+            if (timestamp - last_activity) > timeout + granularity:
                 has_timed_out = True
             if has_timed_out:
                 request.session.pop('last_activity')
@@ -140,8 +143,14 @@ class HorizonMiddleware(object):
                             'max_cookie_size': max_cookie_size,
                         }
                     )
-        # We have a valid session, so we set the timestamp
-        request.session['last_activity'] = timestamp
+        # We have a valid session, so we set the timestamp. Saving the
+        # session is costly, so it's only done once the timestamp moved by
+        # more than SESSION_ACTIVITY_GRANULARITY seconds.
+        last_activity = request.session.get('last_activity', None)
+        granularity = getattr(settings, 'SESSION_ACTIVITY_GRANULARITY', 0)
+        if (not isinstance(last_activity, int) or
+                timestamp - last_activity > granularity):
+            request.session['last_activity'] = timestamp
 
     def process_exception(self, request, exception):
         """Catches internal Horizon exception classes such as NotAuthorized,
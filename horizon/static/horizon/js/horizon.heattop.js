@@ -176,7 +176,12 @@ function build_reverse_links(node){
 
 function ajax_poll(poll_time){
   setTimeout(function() {
-    $.getJSON(ajax_url, function(json) {
+    $.getJSON(ajax_url, {since: graph.version}, function(json) {
+      //nothing changed since the last poll
+      if (!json) { return; }
+      json = horizon.topology.apply_delta(graph, json, {nodes: 'name'});
+      graph = json;
+
       //update d3 data element
       $("#d3_data").attr("data-d3_data", JSON.stringify(json));
 
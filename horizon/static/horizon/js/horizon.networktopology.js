@@ -123,10 +123,19 @@ horizon.network_topology = {
     if($('#networktopology').length === 0) {
       return;
     }
-    $.getJSON($('#networktopology').data('networktopology') + '?' + $.now(),
+    var params = {};
+    if (self.model && self.model.version) {
+      params.since = self.model.version;
+    }
+    $.getJSON($('#networktopology').data('networktopology'), params,
       function(data) {
-        self.model = data;
-        self.data_convert();
+        // Nothing changed since the last poll, the server answered 304.
+        if (data) {
+          self.model = horizon.topology.apply_delta(self.model || {}, data, {
+            servers: 'id', networks: 'id', ports: 'id', routers: 'id'
+          });
+          self.data_convert();
+        }
         setTimeout(function(){
           self.load_network_info();
         }, self.reload_duration);
@@ -0,0 +1,36 @@
+/*
+  Helpers of the polled topology graphs.
+
+  The topology views answer a poll made with the version of the graph the
+  page already has (the "since" parameter) either with a 304 response when
+  the graph didn't change, or with the items added, changed and removed
+  since that version, in "delta". apply_delta returns the new graph.
+*/
+horizon.topology = {
+  apply_delta: function(model, data, keys) {
+    if (!data.delta) {
+      return data;
+    }
+    var result = $.extend({}, data);
+    delete result.delta;
+    delete result.since;
+    $.each(data.delta, function(name, delta) {
+      var key = keys[name];
+      var changed = {};
+      var removed = {};
+      $.each(delta.changed, function(i, item) {
+        changed[item[key]] = item;
+      });
+      $.each(delta.removed, function(i, item_key) {
+        removed[item_key] = true;
+      });
+      result[name] = $.map(model[name] || [], function(item) {
+        if (removed[item[key]]) {
+          return null;
+        }
+        return changed[item[key]] || item;
+      }).concat(delta.added);
+    });
+    return result;
+  }
+};
@@ -131,10 +131,39 @@ class BaseAction(html.HTMLElement):
 
         if policy_check and self.policy_rules:
             target = self.get_policy_target(request, datum)
-            return (policy_check(self.policy_rules, request, target) and
+            return (self._check_policy(policy_check, request, target) and
                     self.allowed(request, datum))
         return self.allowed(request, datum)
 
+    def _check_policy(self, policy_check, request, target):
+        # Most rows of a table share the same policy target (the targets
+        # only carry project, user and domain ids), so the decisions are
+        # remembered by the table for as long as it lives.
+        decisions = getattr(self.table, '_policy_decisions', None)
+        if decisions is None:
+            return policy_check(self.policy_rules, request, target)
+        try:
+            key = (tuple(tuple(rule) for rule in self.policy_rules),
+                   tuple(sorted((target or {}).items())))
+            hash(key)
+        except TypeError:
+            return policy_check(self.policy_rules, request, target)
+        if key not in decisions:
+            decisions[key] = policy_check(self.policy_rules, request, target)
+        return decisions[key]
+
+    def bind(self, datum):
+        """Returns a copy of this action bound to a single row's ``datum``.
+
+        Only the instance attributes are copied and ``attrs`` is the sole
+        attribute which is duplicated, so it can be modified per row.
+        """
+        bound_action = self.__class__.__new__(self.__class__)
+        bound_action.__dict__.update(self.__dict__)
+        bound_action.attrs = dict(self.attrs)
+        bound_action.datum = datum
+        return bound_action
+
     def update(self, request, datum):
         """Allows per-action customization based on current conditions.
 
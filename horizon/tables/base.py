@@ -18,6 +18,7 @@ import json
 import logging
 from operator import attrgetter
 import sys
+import uuid
 
 from django.core import exceptions as core_exceptions
 from django.core import urlresolvers
@@ -28,11 +29,15 @@ from django.template.defaultfilters import slugify  # noqa
 from django.template.defaultfilters import truncatechars  # noqa
 from django.template.loader import render_to_string
 from django.utils.datastructures import SortedDict
+from django.utils.encoding import force_text
+from django.utils.formats import localize
+from django.utils.html import conditional_escape
 from django.utils.html import escape
 from django.utils import http
 from django.utils.http import urlencode
 from django.utils.safestring import mark_safe
 from django.utils import termcolors
+from django.utils.timezone import template_localtime
 from django.utils.translation import ugettext_lazy as _
 import six
 
@@ -49,6 +54,23 @@ PALETTE = termcolors.PALETTES[termcolors.DEFAULT_PALETTE]
 STRING_SEPARATOR = "__"
 
 
+def _resolve_silently(obj, name):
+    """Returns ``getattr(obj, name)`` the way a template variable resolves.
+
+    The compiled rows render without the template engine, which turns the
+    errors of a variable lookup into an empty string. Those are kept
+    silent here too, e.g. a link callable failing on incomplete data.
+    """
+    try:
+        return getattr(obj, name)
+    except (AttributeError, TypeError):
+        return ''
+    except Exception as e:
+        if getattr(e, 'silent_variable_failure', False):
+            return ''
+        raise
+
+
 class Column(html.HTMLElement):
     """A class which represents a single column in a :class:`.DataTable`.
 
@@ -600,8 +622,13 @@ class Row(html.HTMLElement):
             return ''
 
     def render(self):
-        return render_to_string("horizon/common/_data_table_row.html",
-                                {"row": self})
+        if not self.table._meta.compiled_rows:
+            return render_to_string("horizon/common/_data_table_row.html",
+                                    {"row": self})
+        # Equivalent to the row template, minus the template engine.
+        cells = u"".join(force_text(cell.render()) for cell in self)
+        return mark_safe(u"<tr%s>%s</tr>" % (
+            _resolve_silently(self, 'attr_string'), cells))
 
     def get_cells(self):
         """Returns the bound cells for this row in order."""
@@ -820,6 +847,13 @@ class Cell(html.HTMLElement):
                                           self)
 
     def render(self):
+        table = self.row.table
+        if table._meta.compiled_rows and not self.inline_edit_available:
+            formatter = table.get_cell_formatter(self.column)
+            attr_string = _resolve_silently(self, 'attr_string')
+            value = _resolve_silently(self, 'value')
+            return mark_safe(u"<td%s>%s</td>" % (attr_string,
+                                                 formatter(value)))
         return render_to_string("horizon/common/_data_table_cell.html",
                                 {"cell": self})
 
@@ -964,6 +998,22 @@ class DataTableOptions(object):
 
         A list of permission names which this table requires in order to be
         displayed. Defaults to an empty list (``[]``).
+
+    .. attribute:: compiled_rows
+
+        Boolean to control whether rows and cells without inline editing are
+        rendered directly in Python rather than through the
+        ``_data_table_row.html`` and ``_data_table_cell.html`` templates.
+        Set it to ``False`` if those templates are overridden.
+        Default: ``True``.
+
+    .. attribute:: streaming
+
+        Boolean to control whether :class:`~horizon.tables.DataTableView`
+        streams the page containing this table, sending the markup preceding
+        the rows first and then each row as soon as it is rendered. Tables
+        with a summary row are never streamed since the summation is only
+        known once every row has been rendered. Default: ``False``.
     """
     def __init__(self, options):
         self.name = getattr(options, 'name', self.__class__.__name__)
@@ -990,6 +1040,8 @@ class DataTableOptions(object):
                                        "no_data_message",
                                        _("No items to display."))
         self.permissions = getattr(options, 'permissions', [])
+        self.compiled_rows = getattr(options, 'compiled_rows', True)
+        self.streaming = getattr(options, 'streaming', False)
 
         # Set self.filter if we have any FilterActions
         filter_actions = [action for action in self.table_actions if
@@ -1121,6 +1173,26 @@ class DataTableMetaclass(type):
         return type.__new__(mcs, name, bases, attrs)
 
 
+class StreamedRows(object):
+    """Stands in for the rows of a table while it is being streamed.
+
+    It reports the number of rows the table will render and, when iterated,
+    yields itself once so that the table template renders the placeholder
+    which is later replaced by the actual rows.
+    """
+    def __init__(self, table):
+        self.table = table
+
+    def __len__(self):
+        return len(self.table.filtered_data)
+
+    def __iter__(self):
+        yield self
+
+    def render(self):
+        return mark_safe(self.table._stream_marker)
+
+
 @six.add_metaclass(DataTableMetaclass)
 class DataTable(object):
     """A class which defines a table with all data and associated actions.
@@ -1165,6 +1237,11 @@ class DataTable(object):
             columns.append((key, column))
         self.columns = SortedDict(columns)
         self._populate_data_cache()
+        self._templates = {}
+        self._actions_context = None
+        self._cell_formatters = {}
+        self._policy_decisions = {}
+        self._stream_marker = None
 
         # Associate these actions with this table
         for action in self.base_actions.values():
@@ -1183,6 +1260,15 @@ class DataTable(object):
     def name(self):
         return self._meta.name
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._object_index = None
+
     @property
     def footer(self):
         return self._meta.footer
@@ -1263,6 +1349,44 @@ class DataTable(object):
             LOG.exception("Error while checking action permissions.")
             return None
 
+    def _get_template(self, template_path):
+        # Row actions are rendered once per row; load each template only once.
+        if template_path not in self._templates:
+            self._templates[template_path] = \
+                template.loader.get_template(template_path)
+        return self._templates[template_path]
+
+    def _render_actions(self, template_path, extra_context):
+        # The context processors only need to run once per table, each render
+        # pushes its own variables on top of the shared request context.
+        if self._actions_context is None:
+            self._actions_context = template.RequestContext(self.request)
+        context = self._actions_context
+        context.update(extra_context)
+        try:
+            return self._get_template(template_path).render(context)
+        finally:
+            context.pop()
+
+    def get_cell_formatter(self, column):
+        """Returns a callable turning a cell value into escaped HTML.
+
+        The callable mirrors what ``{{ cell.value }}`` does in the cell
+        template (time zone conversion, localization and autoescaping) and
+        is built once per column.
+        """
+        if column not in self._cell_formatters:
+            if column.wrap_list:
+                wrapper = u"<ul>%s</ul>"
+            else:
+                wrapper = u"%s"
+
+            def formatter(value):
+                value = localize(template_localtime(value))
+                return wrapper % conditional_escape(force_text(value))
+            self._cell_formatters[column] = formatter
+        return self._cell_formatters[column]
+
     def is_browser_table(self):
         if self._meta.browser_table:
             return True
@@ -1315,13 +1439,7 @@ class DataTable(object):
         """
         if not isinstance(lookup, six.text_type):
             lookup = six.text_type(str(lookup), 'utf-8')
-        matches = []
-        for datum in self.data:
-            obj_id = self.get_object_id(datum)
-            if not isinstance(obj_id, six.text_type):
-                obj_id = six.text_type(str(obj_id), 'utf-8')
-            if obj_id == lookup:
-                matches.append(datum)
+        matches = self._get_object_index().get(lookup, [])
         if len(matches) > 1:
             raise ValueError("Multiple matches were returned for that id: %s."
                              % matches)
@@ -1331,6 +1449,20 @@ class DataTable(object):
                                      % lookup)
         return matches[0]
 
+    def _get_object_index(self):
+        # The index is dropped whenever ``data`` is reassigned and rebuilt if
+        # the data was resized in place.
+        data = self.data or []
+        if self._object_index is None or self._object_index[0] != len(data):
+            index = {}
+            for datum in data:
+                obj_id = self.get_object_id(datum)
+                if not isinstance(obj_id, six.text_type):
+                    obj_id = six.text_type(str(obj_id), 'utf-8')
+                index.setdefault(obj_id, []).append(datum)
+            self._object_index = (len(data), index)
+        return self._object_index[1]
+
     @property
     def has_actions(self):
         """Boolean. Indicates whether there are any available actions on this
@@ -1367,9 +1499,7 @@ class DataTable(object):
         bound_actions = []
         for action in self._meta.row_actions:
             # Copy to allow modifying properties per row
-            bound_action = copy.copy(self.base_actions[action.name])
-            bound_action.attrs = copy.copy(bound_action.attrs)
-            bound_action.datum = datum
+            bound_action = self.base_actions[action.name].bind(datum)
             # Remove disallowed actions.
             if not self._filter_action(bound_action,
                                        self.request,
@@ -1399,7 +1529,6 @@ class DataTable(object):
     def render_table_actions(self):
         """Renders the actions specified in ``Meta.table_actions``."""
         template_path = self._meta.table_actions_template
-        table_actions_template = template.loader.get_template(template_path)
         bound_actions = self.get_table_actions()
         extra_context = {"table_actions": bound_actions,
                          "table_actions_buttons": [],
@@ -1412,9 +1541,8 @@ class DataTable(object):
                 extra_context['table_actions_menu'].append(action)
             elif action != extra_context.get('filter'):
                 extra_context['table_actions_buttons'].append(action)
-        context = template.RequestContext(self.request, extra_context)
         self.set_multiselect_column_visibility(len(bound_actions) > 0)
-        return table_actions_template.render(context)
+        return self._render_actions(template_path, extra_context)
 
     def render_row_actions(self, datum, pull_right=True, row=False):
         """Renders the actions specified in ``Meta.row_actions`` using the
@@ -1425,14 +1553,11 @@ class DataTable(object):
             template_path = self._meta.row_actions_row_template
         else:
             template_path = self._meta.row_actions_dropdown_template
-
-        row_actions_template = template.loader.get_template(template_path)
         bound_actions = self.get_row_actions(datum)
         extra_context = {"row_actions": bound_actions,
                          "row_id": self.get_object_id(datum),
                          "pull_right": pull_right}
-        context = template.RequestContext(self.request, extra_context)
-        return row_actions_template.render(context)
+        return self._render_actions(template_path, extra_context)
 
     @staticmethod
     def parse_action(action_string):
@@ -1760,14 +1885,19 @@ class DataTable(object):
 
     def get_rows(self):
         """Return the row data for this table broken out by columns."""
-        rows = []
+        if self._stream_marker:
+            return StreamedRows(self)
+        return list(self.iter_rows())
+
+    def iter_rows(self):
+        """Yields the rows of this table one at a time."""
         try:
             for datum in self.filtered_data:
                 row = self._meta.row_class(self, datum)
                 if self.get_object_id(datum) == self.current_item_id:
                     self.selected = True
                     row.classes.append('current_selected')
-                rows.append(row)
+                yield row
         except Exception:
             # Exceptions can be swallowed at the template level here,
             # re-raising as a TemplateSyntaxError makes them visible.
@@ -1776,7 +1906,33 @@ class DataTable(object):
             raise six.reraise(template.TemplateSyntaxError, exc_info[1],
                               exc_info[2])
 
-        return rows
+    def can_stream(self):
+        """Boolean. Indicates whether this table may be streamed."""
+        return self._meta.streaming and not self.needs_summary_row
+
+    def render_stream(self, render=None):
+        """Returns an iterator yielding the rendered table in chunks.
+
+        ``render`` is a callable returning the markup the table is embedded
+        in, :meth:`render` by default. It is called right away with the rows
+        of this table replaced by a placeholder. The returned iterator yields
+        the markup preceding the placeholder, each row as it is rendered and
+        finally the remaining markup.
+        """
+        self._stream_marker = '<!-- %s -->' % uuid.uuid4().hex
+        try:
+            content = (render or self.render)()
+            head, marker, tail = content.partition(self._stream_marker)
+        finally:
+            self._stream_marker = None
+        return self._iter_stream(head, marker, tail)
+
+    def _iter_stream(self, head, marker, tail):
+        yield head
+        if marker:
+            for row in self.iter_rows():
+                yield row.render()
+        yield tail
 
     def css_classes(self):
         """Returns the additional CSS class to be added to <table> tag."""
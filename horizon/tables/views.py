@@ -14,6 +14,8 @@
 
 from collections import defaultdict
 
+import django
+from django import http
 from django import shortcuts
 
 from horizon import views
@@ -177,9 +179,16 @@ class DataTableView(MultiTableView):
 
     Optionally, you can override the ``has_more_data`` method to trigger
     pagination handling for APIs that support it.
+
+    Set ``streaming`` to ``True`` (or the table's ``Meta.streaming`` option)
+    to stream the rows of the table to the client as they are rendered
+    instead of building the whole page in memory first. Since the response
+    headers are sent before the rows are rendered, nothing rendered as part
+    of a row can alter the session or add messages to the page.
     """
     table_class = None
     context_object_name = 'table'
+    streaming = None
 
     def _get_data_dict(self):
         if not self._data:
@@ -215,6 +224,36 @@ class DataTableView(MultiTableView):
             context[self.context_object_name] = self.table
         return context
 
+    def get(self, request, *args, **kwargs):
+        handled = self.construct_tables()
+        if handled:
+            return handled
+        context = self.get_context_data(**kwargs)
+        if self.should_stream():
+            return self.render_to_stream(context)
+        return self.render_to_response(context)
+
+    def should_stream(self):
+        table = getattr(self, "table", None)
+        if table is None or self.request.is_ajax():
+            return False
+        if self.streaming is not None:
+            return self.streaming and not table.needs_summary_row
+        return table.can_stream()
+
+    def render_to_stream(self, context):
+        """Renders the page and returns a response streaming the rows."""
+        response = self.render_to_response(context)
+        chunks = self.table.render_stream(lambda: response.rendered_content)
+        # NOTE: StreamingHttpResponse was introduced in Django 1.5, older
+        # versions stream iterators passed to HttpResponse.
+        if django.VERSION >= (1, 5):
+            stream = http.StreamingHttpResponse(chunks)
+        else:
+            stream = http.HttpResponse(chunks)
+        stream['Content-Type'] = response['Content-Type']
+        return stream
+
     def post(self, request, *args, **kwargs):
         # If the server side table filter changed then go back to the first
         # page of data. Otherwise GET and POST handling are the same.
@@ -14,17 +14,23 @@
 
 from __future__ import absolute_import
 
+import hashlib
+
 from horizon.contrib import bootstrap_datepicker
 
 from django.conf import settings
+from django.core.cache import cache
 from django import template
+from django.template.loader import render_to_string
 from django.utils.datastructures import SortedDict
 from django.utils.encoding import force_text
+from django.utils.safestring import mark_safe
 from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 
 from horizon.base import Horizon  # noqa
 from horizon import conf
+from horizon.utils import memoized
 
 
 register = template.Library()
@@ -44,10 +50,62 @@ def has_permissions_on_list(components, user):
             in components if has_permissions(user, component)]
 
 
-@register.inclusion_tag('horizon/_accordion_nav.html', takes_context=True)
-def horizon_nav(context):
+def _get_registry_fingerprint():
+    registry = []
+    for dash in Horizon.get_dashboards():
+        groups = [(slug, [(panel.slug, getattr(panel, 'permissions', ()))
+                          for panel in group])
+                  for slug, group in dash.get_panel_groups().items()]
+        registry.append((dash.slug, getattr(dash, 'permissions', ()),
+                         groups))
+    return registry
+
+
+def _get_nav_fingerprint(request, name, current):
+    """Returns the cache key of a navigation fragment.
+
+    The navigation only depends on what the user is allowed to see: the
+    roles of the user, the services of the catalog and the region (which
+    determine the available API extensions), as well as on the current
+    dashboard and panel, the language and the registered panels. It's
+    shared by all the users having the same roles in the same region.
+
+    Returns ``None`` for users without roles, whose permissions can't be
+    fingerprinted.
+    """
+    user = request.user
+    if not user.is_authenticated() or not hasattr(user, 'roles'):
+        return None
+    catalog = getattr(user, 'service_catalog', None) or []
+    key_data = (sorted(role['name'] for role in user.roles),
+                sorted(service.get('type') for service in catalog),
+                getattr(user, 'services_region', None),
+                getattr(user, 'user_domain_id', None),
+                getattr(user, 'domain_id', None),
+                current,
+                translation.get_language(),
+                _get_registry_fingerprint())
+    return 'horizon.nav:%s:%s' % (name, hashlib.md5(
+        repr(key_data).encode('utf-8')).hexdigest())
+
+
+def _render_nav(context, name, template_name, get_nav_context, current):
+    """Renders a navigation fragment, from the cache when possible."""
     if 'request' not in context:
-        return {}
+        return mark_safe(render_to_string(template_name, {}))
+    ttl = memoized.get_ttl('horizon.nav', 300)
+    key = _get_nav_fingerprint(context['request'], name, current)
+    if not ttl or key is None:
+        return mark_safe(render_to_string(template_name,
+                                          get_nav_context(context)))
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string(template_name, get_nav_context(context))
+        cache.set(key, html, ttl)
+    return mark_safe(html)
+
+
+def _get_horizon_nav_context(context):
     current_dashboard = context['request'].horizon.get('dashboard', None)
     current_panel_group = None
     current_panel = context['request'].horizon.get('panel', None)
@@ -82,11 +140,16 @@ def horizon_nav(context):
             'request': context['request']}
 
 
-@register.inclusion_tag('horizon/_nav_list.html', takes_context=True)
-def horizon_main_nav(context):
-    """Generates top-level dashboard navigation entries."""
-    if 'request' not in context:
-        return {}
+@register.simple_tag(takes_context=True)
+def horizon_nav(context):
+    horizon = context['request'].horizon if 'request' in context else {}
+    current = [getattr(horizon.get(name), 'slug', None)
+               for name in ('dashboard', 'panel')]
+    return _render_nav(context, 'horizon_nav', 'horizon/_accordion_nav.html',
+                       _get_horizon_nav_context, current)
+
+
+def _get_horizon_main_nav_context(context):
     current_dashboard = context['request'].horizon.get('dashboard', None)
     dashboards = []
     for dash in Horizon.get_dashboards():
@@ -101,11 +164,16 @@ def horizon_main_nav(context):
             'request': context['request']}
 
 
-@register.inclusion_tag('horizon/_subnav_list.html', takes_context=True)
-def horizon_dashboard_nav(context):
-    """Generates sub-navigation entries for the current dashboard."""
-    if 'request' not in context:
-        return {}
+@register.simple_tag(takes_context=True)
+def horizon_main_nav(context):
+    """Generates top-level dashboard navigation entries."""
+    horizon = context['request'].horizon if 'request' in context else {}
+    current = getattr(horizon.get('dashboard'), 'slug', None)
+    return _render_nav(context, 'horizon_main_nav', 'horizon/_nav_list.html',
+                       _get_horizon_main_nav_context, current)
+
+
+def _get_horizon_dashboard_nav_context(context):
     dashboard = context['request'].horizon['dashboard']
     panel_groups = dashboard.get_panel_groups()
     non_empty_groups = []
@@ -131,6 +199,17 @@ def horizon_dashboard_nav(context):
             'request': context['request']}
 
 
+@register.simple_tag(takes_context=True)
+def horizon_dashboard_nav(context):
+    """Generates sub-navigation entries for the current dashboard."""
+    horizon = context['request'].horizon if 'request' in context else {}
+    current = [getattr(horizon.get(name), 'slug', None)
+               for name in ('dashboard', 'panel')]
+    return _render_nav(context, 'horizon_dashboard_nav',
+                       'horizon/_subnav_list.html',
+                       _get_horizon_dashboard_nav_context, current)
+
+
 @register.filter
 def quota(val, units=None):
     if val == float("inf"):
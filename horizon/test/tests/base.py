@@ -19,6 +19,7 @@
 
 from django.conf import settings
 from django.contrib.auth.models import User  # noqa
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured  # noqa
 from django.core import urlresolvers
 from django.utils.importlib import import_module  # noqa
@@ -521,3 +522,16 @@ class RbacHorizonTests(test.TestCase):
                                  ['<Panel: rbac_panel_yes>'])
 
         self.assertTrue(dogs.can_access(context))
+
+    def test_access_cached(self):
+        cache.clear()
+        self.request.session['token'] = 'token'
+        context = {'request': self.request}
+        dogs = horizon.get_dashboard("dogs")
+        self.assertTrue(dogs.can_access(context))
+
+        # The session only holds a fingerprint of the token.
+        fingerprint = self.request.session['allowed']
+        self.assertEqual(16, len(fingerprint))
+        allowed = cache.get('horizon.allowed:%s' % fingerprint)
+        self.assertTrue(allowed['%s.%s' % (Dogs.__module__, Dogs.__name__)])
@@ -18,6 +18,7 @@ import time
 from django.conf import settings
 
 from django.http import HttpResponseRedirect  # noqa
+from django.test.utils import override_settings
 
 from horizon import exceptions
 from horizon import middleware
@@ -48,6 +49,26 @@ class MiddlewareTests(test.TestCase):
         self.assertEqual(302, resp.status_code)
         self.assertEqual(requested_url, resp.get('Location'))
 
+    @override_settings(SESSION_ACTIVITY_GRANULARITY=60)
+    def test_session_activity_granularity(self):
+        request = self.factory.get('/project/instances/')
+        try:
+            timeout = settings.SESSION_TIMEOUT
+        except AttributeError:
+            timeout = 1800
+        last_activity = int(time.time()) - (timeout + 30)
+        request.session['last_activity'] = last_activity
+        mw = middleware.HorizonMiddleware()
+        has_timed_out, timestamp = mw._check_has_timed_timeout(request)
+        self.assertFalse(has_timed_out)
+
+        last_activity = timestamp - 30
+        request.session['last_activity'] = last_activity
+        request.session.modified = False
+        self.assertIsNone(mw.process_request(request))
+        self.assertEqual(last_activity, request.session['last_activity'])
+        self.assertFalse(request.session.modified)
+
     def test_process_response_redirect_on_ajax_request(self):
         url = settings.LOGIN_URL
         mw = middleware.HorizonMiddleware()
@@ -18,9 +18,11 @@ from django import forms
 from django import http
 from django import shortcuts
 from django.template import defaultfilters
+from django.test.utils import override_settings  # noqa
 
 from mox3.mox import IsA  # noqa
 
+from horizon import exceptions
 from horizon import tables
 from horizon.tables import formset as table_formset
 from horizon.tables import views as table_views
@@ -647,6 +649,87 @@ class DataTableTests(test.TestCase):
         self.assertNotContains(resp_optional, '<ul>')
         self.assertNotContains(resp_optional, '</ul>')
 
+    def test_compiled_row_rendering_matches_template(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        compiled = [row.render() for row in self.table.get_rows()]
+
+        self.table = MyTable(self.request, TEST_DATA)
+        self.table._meta.compiled_rows = False
+        try:
+            rendered = [row.render() for row in self.table.get_rows()]
+        finally:
+            self.table._meta.compiled_rows = True
+        for compiled_row, rendered_row in zip(compiled, rendered):
+            self.assertHTMLEqual(compiled_row, rendered_row)
+
+    def test_row_actions_policy_decisions_are_cached(self):
+        class PolicyLinkAction(MyLinkAction):
+            policy_rules = (("compute", "compute:get"),)
+
+        class PolicyTable(tables.DataTable):
+            name = tables.Column('name')
+
+            class Meta(object):
+                name = "policy_table"
+                row_actions = (PolicyLinkAction,)
+
+        checks = []
+
+        def policy_check(rules, request, target):
+            checks.append((rules, target))
+            return True
+
+        with override_settings(POLICY_CHECK_FUNCTION=policy_check):
+            table = PolicyTable(self.request, TEST_DATA)
+            for datum in TEST_DATA:
+                actions = table.get_row_actions(datum)
+                self.assertEqual(1, len(actions))
+                self.assertEqual(datum, actions[0].datum)
+                self.assertIsNot(table.base_actions['login'], actions[0])
+                self.assertIsNot(table.base_actions['login'].attrs,
+                                 actions[0].attrs)
+        self.assertEqual(1, len(checks))
+
+    def test_get_object_by_id(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.assertEqual(TEST_DATA[1], self.table.get_object_by_id('2'))
+        self.assertEqual(TEST_DATA[2], self.table.get_object_by_id(3))
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '4')
+
+        # Reassigning the data invalidates the index.
+        self.table.data = TEST_DATA_2
+        self.assertEqual(TEST_DATA_2[0], self.table.get_object_by_id('1'))
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '2')
+
+        self.table.data = TEST_DATA + TEST_DATA_2
+        self.assertRaises(ValueError, self.table.get_object_by_id, '1')
+
+    def test_table_render_stream(self):
+        class StreamingTable(tables.DataTable):
+            name = tables.Column('name')
+
+            class Meta(object):
+                name = "streaming_table"
+                streaming = True
+
+        self.table = StreamingTable(self.request, TEST_DATA)
+        self.assertTrue(self.table.can_stream())
+        chunks = list(self.table.render_stream())
+        # The markup before the rows, one chunk per row and the rest.
+        self.assertEqual(len(TEST_DATA) + 2, len(chunks))
+        resp = http.HttpResponse(''.join(chunks))
+        self.assertContains(resp, '<table id="streaming_table"', 1)
+        self.assertContains(resp, 'id="streaming_table__row__1"', 1)
+        self.assertContains(resp, 'id="streaming_table__row__3"', 1)
+        self.assertContains(resp, 'Displaying 3 items', 1)
+        self.assertNotContains(resp, '<!--')
+
+        self.table = StreamingTable(self.request, [])
+        resp = http.HttpResponse(''.join(self.table.render_stream()))
+        self.assertContains(resp, 'class="odd empty"', 1)
+
     def test_inline_edit_available_cell_rendering(self):
         self.table = MyTable(self.request, TEST_DATA_2)
         row = self.table.get_rows()[0]
@@ -1339,6 +1422,24 @@ class SingleTableViewWithPermissions(SingleTableView):
     table_class = TableWithPermissions
 
 
+class StreamingTable(MyTableWrapList):
+    class Meta(object):
+        name = "my_table"
+        verbose_name = "My Table"
+        status_columns = ["status"]
+        columns = ('id', 'name', 'value', 'optional', 'status')
+        row_class = MyRow
+        column_class = MyColumn
+
+
+class StreamingTableView(SingleTableView):
+    table_class = StreamingTable
+    streaming = True
+
+    def get_data(self):
+        return TEST_DATA_7
+
+
 class MultiTableView(tables.MultiTableView):
     table_classes = (TableWithPermissions, MyTable)
 
@@ -1378,6 +1479,14 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(SingleTableViewWithPermissions.table_class,
                          context['table'].__class__)
 
+    def test_data_table_view_streaming(self):
+        view = self._prepare_view(StreamingTableView)
+        resp = view.get(view.request)
+        self.assertTrue(resp.streaming)
+        content = ''.join(resp.streaming_content)
+        self.assertIn('id="my_table__row__1"', content)
+        self.assertIn('<ul>wrapped name</ul>', content)
+
     def test_multi_table_view_not_authorized(self):
         view = self._prepare_view(MultiTableView)
         context = view.get_context_data()
@@ -19,10 +19,13 @@
 import re
 
 from django.conf import settings
+from django.core.cache import cache
 from django.template import Context  # noqa
 from django.template import Template  # noqa
 from django.utils.text import normalize_newlines  # noqa
+from mox3.mox import IgnoreArg  # noqa
 
+from horizon.templatetags import horizon as horizon_tags
 from horizon.test import helpers as test
 from horizon.test.test_dashboards.cats.dashboard import Cats  # noqa
 from horizon.test.test_dashboards.cats.kittens.panel import Kittens  # noqa
@@ -128,3 +131,35 @@ class TemplateTagTests(test.TestCase):
                                             template_text=text,
                                             context={'request': self.request})
         self.assertEqual(single_line(rendered_str), single_line(expected))
+
+    def test_horizon_main_nav_cache(self):
+        cache.clear()
+        self.request.user.roles = [{'name': 'member'}]
+        self.request.user.service_catalog = [{'type': 'compute'}]
+        text = "{% horizon_main_nav %}"
+        context = {'request': self.request}
+
+        rendered_str = self.render_template(tag_require='horizon',
+                                            template_text=text,
+                                            context=context)
+        self.assertIn('Cats', rendered_str)
+
+        # The navigation is only computed again for other roles.
+        self.mox.StubOutWithMock(horizon_tags,
+                                 '_get_horizon_main_nav_context')
+        horizon_tags._get_horizon_main_nav_context(IgnoreArg()) \
+            .AndReturn({'components': [],
+                        'user': self.request.user,
+                        'current': None,
+                        'request': self.request})
+        self.mox.ReplayAll()
+
+        self.assertEqual(rendered_str,
+                         self.render_template(tag_require='horizon',
+                                              template_text=text,
+                                              context=context))
+        self.request.user.roles = [{'name': 'admin'}]
+        self.assertNotIn('Cats',
+                         self.render_template(tag_require='horizon',
+                                              template_text=text,
+                                              context=context))
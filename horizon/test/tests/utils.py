@@ -14,13 +14,16 @@
 
 import datetime
 import os
+import threading
 
 from django.core.exceptions import ValidationError  # noqa
 import django.template
 from django.template import defaultfilters
+from django.test.utils import override_settings  # noqa
 
 from horizon import forms
 from horizon.test import helpers as test
+from horizon.utils import concurrency
 from horizon.utils import filters
 # we have to import the filter in order to register it
 from horizon.utils.filters import parse_isotime  # noqa
@@ -372,6 +375,151 @@ class MemoizedTests(test.TestCase):
             cache_calls(1)
         self.assertEqual(1, len(values_list))
 
+    @override_settings(MEMOIZED_MAX_SIZE={'default': 2})
+    def test_memoized_decorator_is_bounded(self):
+        values_list = []
+
+        @memoized.memoized
+        def bounded_calls(value):
+            values_list.append(value)
+            return value
+
+        bounded_calls(1)
+        bounded_calls(2)
+        # A hit makes 1 the most recently used entry.
+        bounded_calls(1)
+        bounded_calls(3)
+        self.assertEqual([1, 2, 3], values_list)
+
+        # 2 has been evicted to make room for 3, 1 is still cached.
+        bounded_calls(1)
+        bounded_calls(2)
+        self.assertEqual([1, 2, 3, 2], values_list)
+
+        name = '%s.bounded_calls' % __name__
+        stats = memoized.cache_stats()[name]
+        self.assertEqual(2, stats['hits'])
+        self.assertEqual(4, stats['misses'])
+        self.assertEqual(2, stats['evictions'])
+        self.assertEqual(2, stats['size'])
+
+
+class MemoizedWithTTLTests(test.TestCase):
+    def setUp(self):
+        super(MemoizedWithTTLTests, self).setUp()
+        self.calls = []
+
+        @memoized.memoized_with_ttl('tests.ttl', lambda request: request,
+                                    timeout=60)
+        def cache_calls(request, value):
+            self.calls.append(value)
+            return [value]
+
+        self.cache_calls = cache_calls
+        self.cache_calls.invalidate()
+
+    def test_cached_across_calls_of_same_scope(self):
+        self.assertEqual([1], self.cache_calls('project_a', 1))
+        self.assertEqual([1], self.cache_calls('project_a', 1))
+        self.assertEqual([1], self.calls)
+
+        self.cache_calls('project_b', 1)
+        self.cache_calls('project_a', 2)
+        self.assertEqual([1, 1, 2], self.calls)
+
+    def test_invalidate(self):
+        self.cache_calls('project_a', 1)
+        self.cache_calls.invalidate()
+        self.cache_calls('project_a', 1)
+        self.assertEqual([1, 1], self.calls)
+
+    def test_large_list_cached_in_chunks(self):
+        @memoized.memoized_with_ttl('tests.chunks', lambda request: request,
+                                    timeout=60, chunk_size=3)
+        def list_calls(request, count):
+            self.calls.append(count)
+            return list(range(count))
+
+        list_calls.invalidate()
+        self.assertEqual(list(range(7)), list_calls('project_a', 7))
+        self.assertEqual(list(range(7)), list_calls('project_a', 7))
+        self.assertEqual([], list_calls('project_a', 0))
+        self.assertEqual([], list_calls('project_a', 0))
+        self.assertEqual([7, 0], self.calls)
+
+    @override_settings(MEMOIZED_TTL={'tests.ttl': 0})
+    def test_disabled_by_setting(self):
+        self.cache_calls('project_a', 1)
+        self.cache_calls('project_a', 1)
+        self.assertEqual([1, 1], self.calls)
+
+
+class ConcurrencyTests(test.TestCase):
+    def test_results_are_returned_per_call(self):
+        with concurrency.RequestExecutor(max_workers=4) as executor:
+            futures = executor.map('square', lambda x: x * x, range(10))
+        self.assertEqual([x * x for x in range(10)],
+                         [future.result() for future in futures])
+        self.assertEqual(10, len(executor.timings))
+
+    def test_exception_is_reraised_in_caller(self):
+        def fail():
+            raise ValueError("boom")
+
+        with concurrency.RequestExecutor(max_workers=2) as executor:
+            failed = executor.submit('fail', fail)
+            passed = executor.submit('pass', lambda: 42)
+        self.assertEqual(42, passed.result())
+        self.assertIsInstance(failed.exception(), ValueError)
+        self.assertRaises(ValueError, failed.result)
+
+    def test_pool_is_bounded(self):
+        with concurrency.RequestExecutor(max_workers=3) as executor:
+            executor.map('noop', lambda x: x, range(20))
+            self.assertLessEqual(len(executor._threads), 3)
+
+    def test_inline_execution(self):
+        executor = concurrency.RequestExecutor(max_workers=1)
+        future = executor.submit('inline', lambda: 'done')
+        self.assertTrue(future.done())
+        self.assertEqual([], executor._threads)
+        executor.shutdown()
+        self.assertRaises(RuntimeError, executor.submit, 'late', lambda: 1)
+
+    def test_nested_execution_is_inline(self):
+        def nested():
+            with concurrency.RequestExecutor(max_workers=4) as executor:
+                executor.map('noop', lambda x: x, range(5))
+            return executor
+
+        with concurrency.RequestExecutor(max_workers=2) as executor:
+            future = executor.submit('nested', nested)
+        nested_executor = future.result()
+        self.assertTrue(nested_executor.inline)
+        self.assertEqual([], nested_executor._threads)
+        self.assertEqual(1, len(executor._threads))
+
+    def test_background_execution_uses_threads(self):
+        executor = concurrency.BackgroundExecutor(max_workers=1)
+        future = executor.submit('background', lambda: 'done')
+        self.assertEqual('done', future.result(timeout=5))
+        self.assertEqual(1, len(executor._threads))
+
+    def test_background_pending_calls_are_tracked(self):
+        executor = concurrency.BackgroundExecutor(max_workers=2)
+        release = threading.Event()
+        executor.submit('done', lambda: None).result(timeout=5)
+
+        submitters = [threading.Thread(target=executor.submit,
+                                       args=('wait', release.wait, 5))
+                      for i in range(10)]
+        for submitter in submitters:
+            submitter.start()
+        for submitter in submitters:
+            submitter.join()
+        self.assertEqual(10, len(executor.futures))
+        release.set()
+
 
 class GetPageSizeTests(test.TestCase):
     def test_bad_session_value(self):
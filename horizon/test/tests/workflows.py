@@ -79,6 +79,51 @@ class AdminAction(workflows.Action):
         permissions = ("horizon.test",)
 
 
+PREFETCH_CALLS = []
+
+
+def zone_list(request, context):
+    PREFETCH_CALLS.append(('zones', context.get('project_id')))
+    return [("zone1", "Zone 1"), ("zone2", "Zone 2")]
+
+
+def broken_list(request, context):
+    PREFETCH_CALLS.append(('broken', context.get('project_id')))
+    raise ValueError("Unavailable")
+
+
+class PrefetchActionOne(workflows.Action):
+    zone = forms.ChoiceField(label="Zone")
+    other = forms.ChoiceField(label="Other", required=False)
+
+    class Meta(object):
+        name = "Prefetch Action One"
+        slug = "prefetch_action_one"
+        prefetch = {'zones': zone_list,
+                    'broken': broken_list}
+
+    def populate_zone_choices(self, request, context):
+        return self.get_prefetched('zones')
+
+    def populate_other_choices(self, request, context):
+        try:
+            return self.get_prefetched('broken')
+        except ValueError:
+            return []
+
+
+class PrefetchActionTwo(workflows.Action):
+    zone = forms.ChoiceField(label="Zone")
+
+    class Meta(object):
+        name = "Prefetch Action Two"
+        slug = "prefetch_action_two"
+        prefetch = {'zones': zone_list}
+
+    def populate_zone_choices(self, request, context):
+        return self.get_prefetched('zones')
+
+
 class TestStepOne(workflows.Step):
     action_class = TestActionOne
     contributes = ("project_id", "user_id")
@@ -109,6 +154,20 @@ class AdminStep(workflows.Step):
     before = TestStepTwo
 
 
+class PrefetchStepOne(workflows.Step):
+    action_class = PrefetchActionOne
+    depends_on = ("project_id",)
+
+
+class PrefetchStepTwo(workflows.Step):
+    action_class = PrefetchActionTwo
+
+
+class TestPrefetchWorkflow(workflows.Workflow):
+    slug = "test_prefetch_workflow"
+    default_steps = (PrefetchStepOne, PrefetchStepTwo)
+
+
 class TestWorkflow(workflows.Workflow):
     slug = "test_workflow"
     default_steps = (TestStepOne, TestStepTwo)
@@ -317,3 +376,39 @@ class WorkflowsTests(test.TestCase):
         output = res.render()
         self.assertNotRegexpMatches(str(output),
                                     'class="[^"]*\\bfullscreen\\b[^"]*"')
+
+    def test_workflow_prefetch(self):
+        del PREFETCH_CALLS[:]
+        flow = TestPrefetchWorkflow(self.request,
+                                    context_seed={'project_id': PROJECT_ID})
+        self.assertEqual([], PREFETCH_CALLS)
+
+        step_one, step_two = flow.steps
+        self.assertEqual([("zone1", "Zone 1"), ("zone2", "Zone 2")],
+                         step_one.action.fields['zone'].choices)
+        self.assertEqual([], step_one.action.fields['other'].choices)
+        self.assertEqual([("zone1", "Zone 1"), ("zone2", "Zone 2")],
+                         step_two.action.fields['zone'].choices)
+        # Every call was made once, with the workflow context.
+        self.assertEqual([('broken', PROJECT_ID), ('zones', PROJECT_ID)],
+                         sorted(PREFETCH_CALLS))
+
+    def test_action_prefetch_outside_of_workflow(self):
+        del PREFETCH_CALLS[:]
+        action = PrefetchActionTwo(self.request, {'project_id': PROJECT_ID})
+        self.assertEqual([("zone1", "Zone 1"), ("zone2", "Zone 2")],
+                         action.fields['zone'].choices)
+        self.assertEqual([('zones', PROJECT_ID)], PREFETCH_CALLS)
+
+    def test_workflow_partial_validation(self):
+        del PREFETCH_CALLS[:]
+        req = self.factory.post("/", {'zone': 'zone2'})
+        req.user = self.user
+        flow = TestPrefetchWorkflow(req,
+                                    context_seed={'project_id': PROJECT_ID})
+        step_one, step_two = flow.steps
+        flow.contribute_posted_data([step_two])
+        self.assertTrue(step_two.action.is_valid())
+        # Only the validated step was instantiated and populated.
+        self.assertIsNone(getattr(step_one, '_action', None))
+        self.assertEqual([('zones', PROJECT_ID)], PREFETCH_CALLS)
@@ -0,0 +1,266 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Request-scoped helpers for issuing independent API calls concurrently.
+
+Most Horizon pages gather data from several services whose calls do not
+depend on each other. :class:`RequestExecutor` runs such calls on a small,
+bounded pool of worker threads and hands back :class:`Future` objects. Any
+exception raised by a call is captured together with its traceback and
+re-raised in the calling thread when :meth:`Future.result` is invoked, so
+the usual ``try: ... except Exception: exceptions.handle(request)`` blocks
+keep working exactly as they do for serial code.
+"""
+
+import logging
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.utils import translation
+import six
+from six.moves import queue
+
+
+LOG = logging.getLogger(__name__)
+
+# Marks the worker threads of the executors, see RequestExecutor.
+_worker = threading.local()
+
+
+def get_max_workers(default=8):
+    """Return the configured size of the per-request worker pool."""
+    try:
+        return int(getattr(settings, 'API_CONCURRENCY_MAX_WORKERS', default))
+    except (TypeError, ValueError):
+        return default
+
+
+class Future(object):
+    """The pending result of a call submitted to a :class:`RequestExecutor`.
+
+    ``elapsed`` holds the wall-clock duration of the call in seconds once it
+    has finished.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.elapsed = None
+        self._result = None
+        self._exc_info = None
+        self._done = threading.Event()
+
+    def __repr__(self):
+        return '<%s: %s>' % (self.__class__.__name__, self.name)
+
+    def done(self):
+        return self._done.is_set()
+
+    def run(self, func, args, kwargs):
+        start = time.time()
+        try:
+            self._result = func(*args, **kwargs)
+        except Exception:
+            self._exc_info = sys.exc_info()
+        finally:
+            self.elapsed = time.time() - start
+            LOG.debug("Concurrent call %s finished in %.3fs.",
+                      self.name, self.elapsed)
+            self._done.set()
+
+    def cancel(self):
+        """Mark a call which has not been started as cancelled."""
+        try:
+            raise RuntimeError("%s was cancelled." % self.name)
+        except RuntimeError:
+            self._exc_info = sys.exc_info()
+        self._done.set()
+
+    def exception(self, timeout=None):
+        """Return the exception raised by the call, or ``None``."""
+        self._done.wait(timeout)
+        if self._exc_info:
+            return self._exc_info[1]
+
+    def result(self, timeout=None):
+        """Return the call's return value, re-raising any exception.
+
+        The original traceback is preserved, which means
+        :func:`horizon.exceptions.handle` sees the same exception information
+        it would have seen had the call been made in the current thread.
+        """
+        if not self._done.wait(timeout):
+            raise RuntimeError("Timed out waiting for %s." % self.name)
+        if self._exc_info:
+            six.reraise(*self._exc_info)
+        return self._result
+
+
+class RequestExecutor(object):
+    """Runs independent callables on a bounded pool of worker threads.
+
+    An executor is meant to live for the duration of a single request (or a
+    smaller unit of work within one) and is best used as a context manager,
+    which waits for all outstanding calls and stops the workers on exit::
+
+        with concurrency.RequestExecutor() as executor:
+            servers = executor.submit('servers', nova.server_list, request)
+            flavors = executor.submit('flavors', nova.flavor_list, request)
+        servers, has_more = servers.result()
+
+    Worker threads are started lazily, never more than ``max_workers`` of
+    them. When ``max_workers`` is lower than 2 the calls are made inline at
+    submission time, which keeps the behaviour deterministic (e.g. in tests).
+    The calls are made inline as well when the executor is created by a call
+    already running in a worker thread, so that nested executors don't
+    multiply the number of threads of a request.
+
+    The active translation of the submitting thread is propagated to the
+    workers and ``timings`` maps the name of every finished call to its
+    duration in seconds.
+    """
+
+    def __init__(self, max_workers=None):
+        if max_workers is None:
+            max_workers = get_max_workers()
+        self.max_workers = max_workers
+        self.inline = max_workers < 2 or getattr(_worker, 'active', False)
+        self.futures = []
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(wait=True)
+        return False
+
+    @property
+    def timings(self):
+        return dict((future.name, future.elapsed) for future in self.futures
+                    if future.done())
+
+    def submit(self, name, func, *args, **kwargs):
+        """Schedule ``func(*args, **kwargs)`` and return its :class:`Future`.
+
+        ``name`` identifies the call in logs and in :attr:`timings`.
+        """
+        if self._shutdown:
+            raise RuntimeError("Cannot submit %s after shutdown." % name)
+        future = Future(name)
+        with self._lock:
+            self._add_future(future)
+        if self.inline:
+            future.run(func, args, kwargs)
+            return future
+        self._queue.put((future, func, args, kwargs,
+                         translation.get_language()))
+        self._adjust_thread_count()
+        return future
+
+    def _add_future(self, future):
+        # Called with the lock held.
+        self.futures.append(future)
+
+    def map(self, name, func, iterable):
+        """Submit ``func(item)`` for every item and return the futures."""
+        return [self.submit('%s[%s]' % (name, i), func, item)
+                for i, item in enumerate(iterable)]
+
+    def _adjust_thread_count(self):
+        with self._lock:
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work)
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        _worker.active = True
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, func, args, kwargs, language = item
+            if language:
+                with translation.override(language):
+                    future.run(func, args, kwargs)
+            else:
+                future.run(func, args, kwargs)
+
+    def wait(self):
+        """Block until every submitted call has finished."""
+        for future in self.futures:
+            future.exception()
+
+    def shutdown(self, wait=True, cancel_pending=False):
+        """Stop accepting calls and let the worker threads exit.
+
+        With ``cancel_pending`` the calls which have not been started yet
+        are cancelled, their :meth:`Future.result` raises ``RuntimeError``.
+        """
+        with self._lock:
+            self._shutdown = True
+            while cancel_pending:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                item[0].cancel()
+            for thread in self._threads:
+                self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+            if self.futures:
+                LOG.debug("Concurrent calls finished: %s",
+                          ", ".join("%s=%.3fs" % item for item
+                                    in sorted(self.timings.items())))
+
+
+class BackgroundExecutor(RequestExecutor):
+    """Runs callables which outlive the request on a bounded pool of threads.
+
+    Unlike a :class:`RequestExecutor`, a background executor is shared by
+    all the requests of a process and is never shut down. The calls which
+    don't get a worker wait in the queue, and only the futures of the calls
+    which haven't finished yet are kept in ``futures``. The calls always run
+    in a worker thread, even with a single worker, so that they never block
+    the submitting request.
+    """
+
+    def __init__(self, max_workers):
+        super(BackgroundExecutor, self).__init__(max(max_workers, 1))
+        self.inline = False
+
+    def _add_future(self, future):
+        # The finished calls are dropped along with the addition, under the
+        # same lock, so that concurrent submissions don't lose their future.
+        self.futures = [pending for pending in self.futures
+                        if not pending.done()]
+        self.futures.append(future)
+
+
+def run_concurrently(calls, max_workers=None):
+    """Run several named calls concurrently and return their futures.
+
+    ``calls`` is an iterable of ``(name, func, args, kwargs)`` tuples. The
+    returned dictionary maps every name to its finished :class:`Future`.
+    """
+    with RequestExecutor(max_workers=max_workers) as executor:
+        futures = dict((name, executor.submit(name, func, *args, **kwargs))
+                       for name, func, args, kwargs in calls)
+    return futures
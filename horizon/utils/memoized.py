@@ -12,13 +12,23 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import functools
+import hashlib
+import logging
+import threading
+import uuid
 import warnings
 import weakref
 
+from django.conf import settings
+from django.core.cache import cache
 import six
 
 
+LOG = logging.getLogger(__name__)
+
+
 class UnhashableKeyWarning(RuntimeWarning):
     """Raised when trying to memoize a function with an unhashable argument."""
 
@@ -46,6 +56,97 @@ def _get_key(args, kwargs, remove_callback):
     return weak_args, weak_kwargs
 
 
+class _MemoizedCache(object):
+    """The bounded cache of a single function decorated with :func:`memoized`.
+
+    Cache hits only read from the ``data`` dictionary and set the entry's
+    "referenced" flag, so they never take the lock. Misses and evictions are
+    serialized by the lock. When the cache grows over its size limit, entries
+    are evicted in CLOCK order, an approximation of LRU: the oldest entry is
+    evicted unless it was hit since the clock hand last passed it, in which
+    case it gets a second chance.
+
+    The ``hits``, ``misses`` and ``evictions`` counters are updated without
+    the lock, so they are approximate when many threads use the cache.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.data = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._max_size = None
+        self._max_size_loaded = False
+        self._clock = collections.deque()
+        self._lock = threading.Lock()
+        _caches.add(self)
+
+    @property
+    def max_size(self):
+        # Read lazily, because functions may be decorated before the
+        # settings are configured.
+        if not self._max_size_loaded:
+            sizes = getattr(settings, 'MEMOIZED_MAX_SIZE', {})
+            self._max_size = sizes.get(self.name, sizes.get('default'))
+            self._max_size_loaded = True
+        return self._max_size
+
+    def discard(self, key):
+        # Called from weak reference callbacks, which may run in the middle
+        # of a miss in the same thread, so this must not take the lock.
+        self.data.pop(key, None)
+
+    def store(self, key, value):
+        with self._lock:
+            self.misses += 1
+            self.data[key] = [value, False]
+            max_size = self.max_size
+            if max_size is None:
+                return
+            self._clock.append(key)
+            while len(self.data) > max_size and self._clock:
+                self._evict()
+            # Keys removed by the weak reference callbacks stay in the clock
+            # until the hand reaches them; don't let them pile up.
+            if len(self._clock) > 2 * max(len(self.data), 16):
+                self._clock = collections.deque(key for key in self._clock
+                                                if key in self.data)
+
+    def _evict(self):
+        key = self._clock.popleft()
+        entry = self.data.get(key)
+        if entry is None:
+            return
+        if entry[1]:
+            entry[1] = False
+            self._clock.append(key)
+        elif self.data.pop(key, None) is not None:
+            self.evictions += 1
+
+
+_caches = weakref.WeakSet()
+
+
+def cache_stats():
+    """Return the statistics of all the :func:`memoized` caches.
+
+    The result maps the name of every decorated function to a dictionary
+    with its ``hits``, ``misses``, ``evictions``, current ``size`` and
+    ``max_size``.
+    """
+    stats = {}
+    for func_cache in list(_caches):
+        func_stats = stats.setdefault(func_cache.name, {
+            'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0,
+            'max_size': func_cache.max_size})
+        func_stats['hits'] += func_cache.hits
+        func_stats['misses'] += func_cache.misses
+        func_stats['evictions'] += func_cache.evictions
+        func_stats['size'] += len(func_cache.data)
+    return stats
+
+
 def memoized(func):
     """Decorator that caches function calls.
 
@@ -54,12 +155,16 @@ def memoized(func):
     cached value is returned instead of calling the decorated function again.
 
     The cache uses weak references to the passed arguments, so it doesn't keep
-    them alive in memory forever.
+    them alive in memory forever. Arguments which can't be weakly referenced
+    (strings, numbers...) keep their entries alive, so the number of entries
+    of every decorated function can be limited with the ``MEMOIZED_MAX_SIZE``
+    setting. The usage of the caches is reported by :func:`cache_stats`.
     """
-    # The dictionary in which all the data will be cached. This is a separate
+    # The cache in which all the data will be stored. This is a separate
     # instance for every decorated function, and it's stored in a closure of
     # the wrapped function.
-    cache = {}
+    cache = _MemoizedCache('%s.%s' % (func.__module__, func.__name__))
+    data = cache.data
 
     @functools.wraps(func)
     def wrapped(*args, **kwargs):
@@ -70,13 +175,10 @@ def memoized(func):
 
         def remove(ref):
             """A callback to remove outdated items from cache."""
-            try:
-                # The key here is from closure, and is calculated later.
-                del cache[key]
-            except KeyError:
-                # Some other weak reference might have already removed that
-                # key -- in that case we don't need to do anything.
-                pass
+            # The key here is from closure, and is calculated later. Some
+            # other weak reference might have already removed that key -- in
+            # that case we don't need to do anything.
+            cache.discard(key)
 
         key = _get_key(args, kwargs, remove)
         try:
@@ -85,9 +187,10 @@ def memoized(func):
             # happen once and likely calls some external API, database, or
             # some other slow thing. That's why the hit is in straightforward
             # code, and the miss is in an exception.
-            value = cache[key]
+            entry = data[key]
         except KeyError:
-            value = cache[key] = func(*args, **kwargs)
+            value = func(*args, **kwargs)
+            cache.store(key, value)
         except TypeError:
             # The calculated key may be unhashable when an unhashable object,
             # such as a list, is passed as one of the arguments. In that case,
@@ -97,6 +200,10 @@ def memoized(func):
                 "The key %r is not hashable and cannot be memoized." % (key,),
                 UnhashableKeyWarning, 2)
             value = func(*args, **kwargs)
+        else:
+            entry[1] = True
+            cache.hits += 1
+            value = entry[0]
         return value
     return wrapped
 
@@ -104,3 +211,138 @@ def memoized(func):
 # it doesn't keep the instances in memory forever. We might want to separate
 # them in the future, however.
 memoized_method = memoized
+
+
+def get_ttl(name, default):
+    """Return the cache timeout for ``name``, honouring ``MEMOIZED_TTL``."""
+    timeouts = getattr(settings, 'MEMOIZED_TTL', {})
+    return timeouts.get(name, timeouts.get('default', default))
+
+
+def _get_generation(name):
+    """Return the current generation of the cached values of ``name``.
+
+    Invalidating a decorated function replaces its generation with a new
+    random value, which orphans every previously cached value at once. The
+    orphaned values simply expire from the cache backend later on.
+    """
+    generation_key = 'memoized_ttl:%s:generation' % name
+    generation = cache.get(generation_key)
+    if generation is None:
+        cache.add(generation_key, uuid.uuid4().hex)
+        generation = cache.get(generation_key)
+    return generation
+
+
+class _Chunks(object):
+    """Stands in the cache for a list stored in ``count`` chunks."""
+
+    def __init__(self, count):
+        self.count = count
+
+
+def _chunk_keys(key, count):
+    return ['%s:%d' % (key, index) for index in range(count)]
+
+
+def _cache_get(key):
+    """Return the value cached by :func:`_cache_set`, or ``None``."""
+    value = cache.get(key)
+    if isinstance(value, _Chunks):
+        keys = _chunk_keys(key, value.count)
+        chunks = cache.get_many(keys)
+        if len(chunks) < len(keys):
+            return None
+        value = [item for chunk_key in keys for item in chunks[chunk_key]]
+    return value
+
+
+def _cache_set(key, value, ttl, chunk_size=None):
+    """Cache ``value``, split in chunks of ``chunk_size`` items if a list.
+
+    Cache backends such as memcached reject large values, most of them
+    without raising any error, so the stored entries are read back and a
+    warning is logged if any of them is missing.
+    """
+    chunks = {}
+    if chunk_size and isinstance(value, list):
+        keys = _chunk_keys(key, -(-len(value) // chunk_size))
+        for index, chunk_key in enumerate(keys):
+            chunks[chunk_key] = value[index * chunk_size:
+                                      (index + 1) * chunk_size]
+        value = _Chunks(len(keys))
+    try:
+        # The chunks are set first, they are never read without the entry
+        # which counts them.
+        if chunks:
+            cache.set_many(chunks, ttl)
+        cache.set(key, value, ttl)
+        stored = cache.get_many([key] + list(chunks))
+    except Exception:
+        LOG.warning("Unable to cache %s.", key, exc_info=True)
+        return
+    missing = len(chunks) + 1 - len(stored)
+    if missing:
+        LOG.warning("Unable to cache %s, %d of its %d entries were not "
+                    "stored (they may be too large for the cache backend).",
+                    key, missing, len(chunks) + 1)
+
+
+def memoized_with_ttl(name, scope, timeout=300, dump=None, load=None,
+                      chunk_size=None):
+    """Decorator that caches function calls across requests.
+
+    Unlike :func:`memoized`, whose cache lives only as long as the
+    ``request`` passed to the decorated function, the values are kept in
+    Django's cache framework for ``timeout`` seconds, so they are shared by
+    all the requests (and, with a shared backend such as memcached, by all
+    the processes) which have the same scope.
+
+    The first argument of the decorated function must be the request.
+    ``scope`` is a callable which takes that request and returns a hashable
+    value identifying everyone allowed to see the same result, e.g. the
+    project, region and service endpoint. The cache key is built from the
+    ``name``, that scope and the remaining arguments.
+
+    The timeout can be overridden per ``name`` (or for all the decorated
+    functions, with the ``"default"`` key) in the ``MEMOIZED_TTL`` setting. A
+    timeout of ``0`` disables the cache.
+
+    Values which cannot be pickled (e.g. API client resources holding a
+    reference to their HTTP client) can be converted with ``dump`` before
+    they are stored and back with ``load(value, *args, **kwargs)`` when they
+    are read from the cache.
+
+    Cache backends limit the size of the values, e.g. memcached to 1 MB by
+    default. Large lists are stored in several entries of ``chunk_size``
+    items each when it is given. A warning is logged when a value couldn't
+    be cached.
+
+    The decorated function gains an ``invalidate()`` attribute, which should
+    be called by the API calls that change the cached data.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapped(request, *args, **kwargs):
+            ttl = get_ttl(name, timeout)
+            if not ttl:
+                return func(request, *args, **kwargs)
+            key_data = (_get_generation(name), scope(request),
+                        args, sorted(kwargs.items()))
+            key = 'memoized_ttl:%s:%s' % (
+                name, hashlib.md5(repr(key_data).encode('utf-8')).hexdigest())
+            value = _cache_get(key)
+            if value is not None:
+                if load:
+                    value = load(value, request, *args, **kwargs)
+                return value
+            value = func(request, *args, **kwargs)
+            _cache_set(key, dump(value) if dump else value, ttl, chunk_size)
+            return value
+
+        def invalidate():
+            cache.set('memoized_ttl:%s:generation' % name, uuid.uuid4().hex)
+
+        wrapped.invalidate = invalidate
+        return wrapped
+    return decorator
@@ -12,13 +12,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
+from django import http
 from django import shortcuts
 from django import template
 from django.utils import encoding
 from django.views import generic
 
 import horizon
+from horizon.decorators import require_auth  # noqa
 from horizon import exceptions
+from horizon.utils import memoized
 
 
 class PageTitleMixin(object):
@@ -78,6 +83,14 @@ def user_home(request):
     return shortcuts.redirect(horizon.get_user_home(request.user))
 
 
+@require_auth
+def memoized_stats(request):
+    """Debug view reporting the hits, misses and size of memoized caches."""
+    return http.HttpResponse(json.dumps(memoized.cache_stats(),
+                                        sort_keys=True, indent=2),
+                             content_type='application/json')
+
+
 class APIView(HorizonTemplateView):
     """A quick class-based view for putting API data into a template.
 
@@ -31,11 +31,16 @@ import six
 from horizon import base
 from horizon import exceptions
 from horizon.templatetags.horizon import has_permissions  # noqa
+from horizon.utils import concurrency
 from horizon.utils import html
 
 
 LOG = logging.getLogger(__name__)
 
+# The key under which the results of the prefetch calls are handed to the
+# actions along with their context.
+PREFETCHED_KEY = '_prefetched'
+
 
 class WorkflowContext(dict):
     def __init__(self, workflow, *args, **kwargs):
@@ -71,6 +76,7 @@ class ActionMetaclass(forms.forms.DeclarativeFieldsMetaclass):
                                        _("Processing..."))
         cls.help_text = getattr(opts, "help_text", "")
         cls.help_text_template = getattr(opts, "help_text_template", None)
+        cls.prefetch = getattr(opts, "prefetch", {})
         return cls
 
 
@@ -123,6 +129,16 @@ class Action(forms.Form):
         displayed alongside the Action's fields. In conjunction with
         :meth:`~horizon.workflows.Action.get_help_text` method you can
         customize your help text template to display practically anything.
+
+    .. attribute:: prefetch
+
+        A dictionary mapping names to the API calls this action needs the
+        results of, typically to populate its choices. Each call is a
+        function taking the request and the workflow context. A workflow
+        makes the calls of all its actions concurrently before the first
+        action is instantiated; the action reads the results with
+        :meth:`~horizon.workflows.Action.get_prefetched`. Actions declaring
+        the same name share a single call. Defaults to an empty dictionary.
     """
 
     def __init__(self, request, context, *args, **kwargs):
@@ -135,6 +151,7 @@ class Action(forms.Form):
             raise AttributeError("The action %s must define a handle method."
                                  % self.__class__.__name__)
         self.request = request
+        self._prefetched = (context or {}).get(PREFETCHED_KEY) or {}
         self._populate_choices(request, context)
         self.required_css_class = 'required'
 
@@ -150,6 +167,18 @@ class Action(forms.Form):
             if meth is not None and callable(meth):
                 bound_field.choices = meth(request, context)
 
+    def get_prefetched(self, name):
+        """Returns the result of the ``name`` call declared in ``prefetch``.
+
+        Any exception raised by the call is raised again here, so it can be
+        handled just like if the call was made at this point. The call is
+        made now if the action is used outside of a workflow.
+        """
+        future = self._prefetched.get(name)
+        if future is None:
+            return self.prefetch[name](self.request, self.initial)
+        return future.result()
+
     def get_help_text(self, extra_context=None):
         """Returns the help text for this step."""
         text = ""
@@ -358,12 +387,18 @@ class Step(object):
 
     @property
     def action(self):
+        # Getting the workflow context first adds the posted data to it,
+        # which builds the actions of the posted steps, possibly this one.
+        return self._build_action(self.workflow.context)
+
+    def _build_action(self, workflow_context):
+        """Instantiates the action of the step, once, with the context."""
         if not getattr(self, "_action", None):
             try:
                 # Hook in the action context customization.
-                workflow_context = dict(self.workflow.context)
                 context = self.prepare_action_context(self.workflow.request,
-                                                      workflow_context)
+                                                      dict(workflow_context))
+                context[PREFETCHED_KEY] = self.workflow.prefetch()
                 self._action = self.action_class(self.workflow.request,
                                                  context)
             except Exception:
@@ -618,6 +653,9 @@ class Workflow(html.HTMLElement):
         self.contributions = set([])
         self.entry_point = entry_point
         self.object = None
+        self._prefetched = None
+        self._prefetch_steps = None
+        self._pending_steps = []
 
         # Put together our steps in order. Note that we pre-register
         # non-default steps so that we can identify them and subsequently
@@ -643,15 +681,55 @@ class Workflow(html.HTMLElement):
         self.context_seed = clean_seed
         self.context.update(clean_seed)
 
+        # The posted data is added to the context when it is first needed,
+        # see contribute_posted_data.
         if request and request.method == "POST":
-            for step in self.steps:
-                valid = step.action.is_valid()
-                # Be sure to use the CLEANED data if the workflow is valid.
-                if valid:
-                    data = step.action.cleaned_data
-                else:
-                    data = request.POST
-                self.context = step.contribute(data, self.context)
+            self._pending_steps = list(self.steps)
+
+    @property
+    def context(self):
+        if self._pending_steps:
+            self.contribute_posted_data()
+        return self._context
+
+    @context.setter
+    def context(self, context):
+        self._context = context
+
+    def contribute_posted_data(self, steps=None):
+        """Adds the data posted to the workflow to its context.
+
+        Every step contributes the data cleaned by its action, or the raw
+        posted data if the action is not valid. This happens the first time
+        the context is needed after the workflow has been posted.
+
+        When ``steps`` is given, only the actions of these steps are
+        instantiated (and their choices populated), the steps before them
+        contribute the raw posted data and the steps after them contribute
+        nothing. This is meant for validating some of the steps only.
+        """
+        pending, self._pending_steps = self._pending_steps, []
+        if not pending:
+            return
+        if steps is not None:
+            self._prefetch_steps = steps
+            if not steps:
+                return
+            # The steps after the last one being validated contribute
+            # nothing, and none do if those were all contributed already.
+            validated = [index for index, step in enumerate(pending)
+                         if step in steps]
+            pending = pending[:validated[-1] + 1] if validated else []
+        for step in pending:
+            data = self.request.POST
+            if steps is None or step in steps:
+                # Each action is built with the context contributed by the
+                # steps before it.
+                action = step._build_action(self._context)
+                # Be sure to use the CLEANED data if the step is valid.
+                if action.is_valid():
+                    data = action.cleaned_data
+            self._context = step.contribute(data, self._context)
 
     @property
     def steps(self):
@@ -659,6 +737,30 @@ class Workflow(html.HTMLElement):
             self._gather_steps()
         return self._ordered_steps
 
+    def prefetch(self):
+        """Makes the ``prefetch`` calls of the actions of all the steps.
+
+        The calls are made concurrently the first time this is called, which
+        happens when the first action is instantiated, and receive a copy of
+        the workflow context at that point. Only the calls of the steps being
+        validated are made when :meth:`contribute_posted_data` was given
+        some steps. Returns a dictionary mapping the
+        names of the calls to :class:`~horizon.utils.concurrency.Future`
+        objects.
+        """
+        if self._prefetched is None:
+            context = dict(self.context)
+            calls = {}
+            steps = self._prefetch_steps
+            if steps is None:
+                steps = self.steps
+            for step in steps:
+                for name, func in step.action_class.prefetch.items():
+                    calls.setdefault(name, (name, func, (self.request,
+                                                         context), {}))
+            self._prefetched = concurrency.run_concurrently(calls.values())
+        return self._prefetched
+
     def get_step(self, slug):
         """Returns the instantiated step matching the given slug."""
         for step in self.steps:
@@ -150,8 +150,11 @@ class WorkflowView(hz_views.ModalBackdropMixin, generic.TemplateView):
 
         Returns a dict describing the validation state of the workflow.
         """
+        steps = workflow.steps[start:end + 1]
+        # Only instantiate the actions of the steps being validated.
+        workflow.contribute_posted_data(steps)
         errors = {}
-        for step in workflow.steps[start:end + 1]:
+        for step in steps:
             if not step.action.is_valid():
                 errors[step.slug] = dict(
                     (field, [unicode(error) for error in errors])
@@ -16,6 +16,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from collections import OrderedDict  # noqa
 from collections import Sequence  # noqa
 import logging
 
@@ -176,6 +177,8 @@ class APIDictWrapper(object):
 
 class Quota(object):
     """Wrapper for individual limits in a quota."""
+    __slots__ = ('name', 'limit')
+
     def __init__(self, name, limit):
         self.name = name
         self.limit = limit
@@ -192,9 +195,12 @@ class QuotaSet(Sequence):
     the bracket notation (`qs["my_quota"] = 0`) to add new quota values, and
     use the `get` method to retrieve a specific quota, but otherwise it
     behaves much like a list or tuple, particularly in supporting iteration.
+
+    The quotas are kept in an ordered mapping keyed by name, so looking a
+    quota up and merging sets don't require scanning them.
     """
     def __init__(self, apiresource=None):
-        self.items = []
+        self._quotas = OrderedDict()
         if apiresource:
             if hasattr(apiresource, '_info'):
                 items = apiresource._info.items()
@@ -206,14 +212,20 @@ class QuotaSet(Sequence):
                     continue
                 self[k] = v
 
+    @property
+    def items(self):
+        return list(self._quotas.values())
+
     def __setitem__(self, k, v):
-            v = int(v) if v is not None else v
-            q = Quota(k, v)
-            self.items.append(q)
+        v = int(v) if v is not None else v
+        self._quotas[k] = Quota(k, v)
 
     def __getitem__(self, index):
         return self.items[index]
 
+    def __iter__(self):
+        return iter(self._quotas.values())
+
     def __add__(self, other):
         """Merge another QuotaSet into this one. Existing quotas are
         not overridden.
@@ -225,22 +237,26 @@ class QuotaSet(Sequence):
 
         for item in other:
             if self.get(item.name).limit is None:
-                self.items.append(item)
+                self._quotas[item.name] = item
         return self
 
     def __len__(self):
-        return len(self.items)
+        return len(self._quotas)
 
     def __repr__(self):
         return repr(self.items)
 
     def get(self, key, default=None):
-        match = [quota for quota in self.items if quota.name == key]
-        return match.pop() if len(match) else Quota(key, default)
+        quota = self._quotas.get(key)
+        return quota if quota is not None else Quota(key, default)
 
     def add(self, other):
         return self.__add__(other)
 
+    def remove(self, key):
+        """Removes the quota named ``key`` if the set contains it."""
+        self._quotas.pop(key, None)
+
 
 def get_service_from_catalog(catalog, service_type):
     if catalog:
@@ -302,45 +318,120 @@ def get_url_for_service(service, region, endpoint_type):
     return None
 
 
+class ServiceCatalogIndex(object):
+    """Lookup tables built from a service catalog.
+
+    :func:`url_for` and :func:`is_service_enabled` are called many times
+    while rendering a single page. Rather than scanning the catalog on every
+    call, they look the services up by type and remember every endpoint url
+    resolved for a given service type, region and endpoint type.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.services = {}
+        self.regions = {}
+        self._urls = {}
+        for service in catalog or []:
+            if 'type' not in service or service['type'] in self.services:
+                continue
+            self.services[service['type']] = service
+            self.regions[service['type']] = set(
+                _get_endpoint_region(endpoint)
+                for endpoint in service.get('endpoints', []))
+
+    def get_service(self, service_type):
+        return self.services.get(service_type)
+
+    def get_url(self, service_type, region, endpoint_type):
+        key = (service_type, region, endpoint_type)
+        try:
+            return self._urls[key]
+        except KeyError:
+            service = self.services.get(service_type)
+            url = None
+            if service:
+                url = get_url_for_service(service, region, endpoint_type)
+            self._urls[key] = url
+            return url
+
+    def is_service_enabled(self, service_type, region, service_name=None):
+        regions = self.regions.get(service_type)
+        if not regions:
+            return False
+        # ignore region for identity
+        if service_type != 'identity' and region not in regions:
+            return False
+        if service_name:
+            return self.services[service_type].get('name') == service_name
+        return True
+
+
+def get_service_catalog_index(request):
+    """Returns the :class:`ServiceCatalogIndex` of the current user.
+
+    The index is kept on the user object and rebuilt if the catalog is
+    replaced.
+    """
+    user = request.user
+    catalog = user.service_catalog
+    index = getattr(user, '_service_catalog_index', None)
+    if index is None or index.catalog is not catalog:
+        index = ServiceCatalogIndex(catalog)
+        user._service_catalog_index = index
+    return index
+
+
 def url_for(request, service_type, endpoint_type=None, region=None):
     endpoint_type = endpoint_type or getattr(settings,
                                              'OPENSTACK_ENDPOINT_TYPE',
                                              'publicURL')
     fallback_endpoint_type = getattr(settings, 'SECONDARY_ENDPOINT_TYPE', None)
 
-    catalog = request.user.service_catalog
-    service = get_service_from_catalog(catalog, service_type)
-    if service:
+    index = get_service_catalog_index(request)
+    if index.get_service(service_type):
         if not region:
             region = request.user.services_region
-        url = get_url_for_service(service,
-                                  region,
-                                  endpoint_type)
+        url = index.get_url(service_type, region, endpoint_type)
         if not url and fallback_endpoint_type:
-            url = get_url_for_service(service,
-                                      region,
-                                      fallback_endpoint_type)
+            url = index.get_url(service_type, region, fallback_endpoint_type)
         if url:
             return url
     raise exceptions.ServiceCatalogException(service_type)
 
 
+def cache_scope(service_type):
+    """Returns a scope function for :func:`~horizon.utils.memoized.\
+memoized_with_ttl`.
+
+    API results cached across requests are shared by every token scoped to
+    the same project and talking to the same ``service_type`` endpoint of
+    the same region.
+    """
+    def scope(request):
+        try:
+            endpoint = url_for(request, service_type)
+        except exceptions.ServiceCatalogException:
+            endpoint = None
+        return (request.user.tenant_id, request.user.services_region,
+                endpoint)
+    return scope
+
+
+def resources_to_info(resources):
+    """Returns the picklable ``_info`` dictionaries of API client resources.
+
+    Meant to be used as the ``dump`` function of
+    :func:`~horizon.utils.memoized.memoized_with_ttl`.
+    """
+    return [resource._info for resource in resources]
+
+
 def is_service_enabled(request, service_type, service_name=None):
-    service = get_service_from_catalog(request.user.service_catalog,
-                                       service_type)
-    if service:
-        region = request.user.services_region
-        for endpoint in service.get('endpoints', []):
-            if 'type' not in service:
-                continue
-            # ignore region for identity
-            if service['type'] == 'identity' or \
-               _get_endpoint_region(endpoint) == region:
-                if service_name:
-                    return service.get('name') == service_name
-                else:
-                    return True
-    return False
+    index = get_service_catalog_index(request)
+    return index.is_service_enabled(service_type,
+                                    request.user.services_region,
+                                    service_name)
 
 
 def _get_endpoint_region(endpoint):
@@ -12,6 +12,7 @@
 
 import logging
 import threading
+import time
 
 from ceilometerclient import client as ceilometer_client
 from django.conf import settings
@@ -19,6 +20,8 @@ from django.utils import datastructures
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
+from horizon import messages
+from horizon.utils import concurrency
 from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
@@ -309,23 +312,52 @@ def statistic_list(request, meter_name, query=None, period=None):
     return [Statistic(s) for s in statistics]
 
 
-class ThreadedUpdateResourceWithStatistics(threading.Thread):
-    """Multithread wrapper for update_with_statistics method of
+def get_statistics_concurrency():
+    """Return the settings of the pool fetching resource statistics."""
+    config = {'max_workers': 8,
+              'max_requests': 32,
+              'timeout': 60}
+    config.update(getattr(settings, 'CEILOMETER_STATISTICS_CONCURRENCY', {}))
+    return config
+
+
+_requests_semaphore = None
+_requests_semaphore_lock = threading.Lock()
+
+
+def _get_requests_semaphore():
+    """Return the semaphore capping the statistics requests of a process."""
+    global _requests_semaphore
+    if _requests_semaphore is None:
+        with _requests_semaphore_lock:
+            if _requests_semaphore is None:
+                max_requests = get_statistics_concurrency()['max_requests']
+                _requests_semaphore = threading.BoundedSemaphore(
+                    max_requests)
+    return _requests_semaphore
+
+
+class ThreadedUpdateResourceWithStatistics(object):
+    """Bounded worker pool for update_with_statistics method of
     resource_usage.
 
-    A join logic is placed in process_list class method. All resources
-    will have its statistics attribute filled in separate threads.
+    All resources passed to the process_list class method will have their
+    statistics attribute filled by a pool of at most ``max_workers``
+    threads. Across all requests served by a process, no more than
+    ``max_requests`` resources are updated at the same time. Both values,
+    together with the ``timeout`` (in seconds) after which the remaining
+    resources are given up, are read from the
+    ``CEILOMETER_STATISTICS_CONCURRENCY`` setting.
 
-    The resource_usage object is shared between threads. Each thread is
-    updating one Resource.
+    The resource_usage object is shared between threads. Each call fetches
+    the statistics of one Resource, which are then set in the calling
+    thread, so the resources given up are never modified.
 
     :Parameters:
-      - `resource`: Resource or ResourceAggregate object, that will
-                    be filled by statistic data.
-      - `resources`: List of Resource or ResourceAggregate object,
-                     that will be filled by statistic data.
       - `resource_usage`: Wrapping resource usage object, that holds
                           all statistics data.
+      - `resources`: List of Resource or ResourceAggregate object,
+                     that will be filled by statistic data.
       - `meter_names`: List of meter names of the statistics we want.
       - `period`: In seconds. If no period is given, only one aggregate
                   statistic is returned. If given, a faceted result will be
@@ -341,40 +373,57 @@ class ThreadedUpdateResourceWithStatistics(threading.Thread):
     # and group-by, so all of this optimization will not be necessary.
     # It is planned somewhere to I.
 
-    def __init__(self, resource_usage, resource, meter_names=None,
-                 period=None, filter_func=None, stats_attr=None,
-                 additional_query=None):
-        super(ThreadedUpdateResourceWithStatistics, self).__init__()
-        self.resource_usage = resource_usage
-        self.resource = resource
-        self.meter_names = meter_names
-        self.period = period
-        self.stats_attr = stats_attr
-        self.additional_query = additional_query
-
-    def run(self):
-        # Run the job
-        self.resource_usage.update_with_statistics(
-            self.resource,
-            meter_names=self.meter_names, period=self.period,
-            stats_attr=self.stats_attr, additional_query=self.additional_query)
+    @staticmethod
+    def fetch(resource_usage, resource, **kwargs):
+        with _get_requests_semaphore():
+            return resource_usage.get_statistics(resource, **kwargs)
 
     @classmethod
     def process_list(cls, resource_usage, resources, meter_names=None,
                      period=None, filter_func=None, stats_attr=None,
                      additional_query=None):
-        threads = []
-
-        for resource in resources:
-            # add statistics data into resource
-            thread = cls(resource_usage, resource, meter_names=meter_names,
-                         period=period, stats_attr=stats_attr,
-                         additional_query=additional_query)
-            thread.start()
-            threads.append(thread)
+        """Fill in the statistics of the resources.
 
-        for thread in threads:
-            thread.join()
+        Returns the list of resources whose statistics could not be
+        obtained, either because the request failed or because it did not
+        finish in time. Their meters are left unset.
+        """
+        config = get_statistics_concurrency()
+        deadline = time.time() + config['timeout']
+        executor = concurrency.RequestExecutor(
+            max_workers=max(min(config['max_workers'], len(resources)), 1))
+        # Even a single call runs in a worker thread, so that the timeout
+        # applies to it as well.
+        executor.inline = False
+        futures = []
+        try:
+            for resource in resources:
+                futures.append(executor.submit(
+                    'statistics:%s' % resource.id, cls.fetch,
+                    resource_usage, resource, meter_names=meter_names,
+                    period=period, stats_attr=stats_attr,
+                    additional_query=additional_query))
+
+            failed = []
+            for resource, future in zip(resources, futures):
+                remaining = max(deadline - time.time(), 0)
+                exc = future.exception(remaining)
+                if not future.done():
+                    LOG.warning("Timed out fetching statistics of %s.",
+                                resource.id)
+                    failed.append(resource)
+                elif exc is not None:
+                    LOG.warning("Unable to fetch statistics of %s: %s",
+                                resource.id, exc)
+                    failed.append(resource)
+                else:
+                    # add statistics data into resource
+                    for meter, value in future.result().items():
+                        resource.set_meter(meter, value)
+        finally:
+            # Do not wait for the calls which did not make it in time.
+            executor.shutdown(wait=False, cancel_pending=True)
+        return failed
 
 
 class CeilometerUsage(object):
@@ -538,10 +587,25 @@ class CeilometerUsage(object):
 
         It adds each statistic of each meter_names into the resource
         attributes. Attribute name is the meter name with replaced '.' to '_'.
+        See :meth:`get_statistics` for the parameters.
+        """
+        statistics = self.get_statistics(
+            resource, meter_names=meter_names, period=period,
+            stats_attr=stats_attr, additional_query=additional_query)
+        for meter, value in statistics.items():
+            resource.set_meter(meter, value)
+        return resource
+
+    def get_statistics(self, resource, meter_names=None, period=None,
+                       stats_attr=None, additional_query=None):
+        """Obtaining statistical data of one Resource or ResourceAggregate.
+
+        Returns a dictionary mapping each of the meter_names, with '.'
+        replaced by '_', to its statistics. The resource is left unchanged.
 
         :Parameters:
-          - `resource`: Resource or ResourceAggregate object, that will
-                        be filled by statistic data.
+          - `resource`: Resource or ResourceAggregate object, whose
+                        statistic data is fetched.
           - `meter_names`: List of meter names of which we want the
                            statistics.
           - `period`: In seconds. If no period is given, only one aggregate
@@ -574,6 +638,7 @@ class CeilometerUsage(object):
         # and apply it only to this code.
         # Though I do expect Ceilometer will support bulk requests,
         # so all of this optimization will not be necessary.
+        meters = {}
         for meter in meter_names:
             statistics = statistic_list(self._request, meter,
                                         query=query, period=period)
@@ -581,16 +646,14 @@ class CeilometerUsage(object):
             if statistics:
                 if stats_attr:
                     # I want to load only a specific attribute
-                    resource.set_meter(
-                        meter,
-                        getattr(statistics[0], stats_attr, None))
+                    meters[meter] = getattr(statistics[0], stats_attr, None)
                 else:
                     # I want a dictionary of all statistics
-                    resource.set_meter(meter, statistics)
+                    meters[meter] = statistics
             else:
-                resource.set_meter(meter, None)
+                meters[meter] = None
 
-        return resource
+        return meters
 
     def resources(self, query=None, filter_func=None,
                   with_users_and_tenants=False):
@@ -650,10 +713,11 @@ class CeilometerUsage(object):
             query, filter_func=filter_func,
             with_users_and_tenants=with_users_and_tenants)
 
-        ThreadedUpdateResourceWithStatistics.process_list(
+        failed = ThreadedUpdateResourceWithStatistics.process_list(
             self, resources,
             meter_names=meter_names, period=period, stats_attr=stats_attr,
             additional_query=additional_query)
+        self._warn_incomplete_statistics(failed)
 
         return resources
 
@@ -699,13 +763,21 @@ class CeilometerUsage(object):
         """
         resource_aggregates = self.resource_aggregates(queries)
 
-        ThreadedUpdateResourceWithStatistics.process_list(
+        failed = ThreadedUpdateResourceWithStatistics.process_list(
             self,
             resource_aggregates, meter_names=meter_names, period=period,
             stats_attr=stats_attr, additional_query=additional_query)
+        self._warn_incomplete_statistics(failed)
 
         return resource_aggregates
 
+    def _warn_incomplete_statistics(self, failed):
+        if failed:
+            messages.warning(self._request,
+                             _('Unable to retrieve statistics for %s '
+                               'resources, the results are incomplete.')
+                             % len(failed))
+
 
 def diff_lists(a, b):
     if not a:
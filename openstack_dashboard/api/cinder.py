@@ -30,8 +30,10 @@ from cinderclient.v2.contrib import list_extensions as cinder_list_extensions
 
 from horizon import exceptions
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils.memoized import memoized_with_ttl  # noqa
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import connection_pool
 from openstack_dashboard.api import nova
 
 LOG = logging.getLogger(__name__)
@@ -170,6 +172,7 @@ def cinderclient(request):
                                      http_log_debug=settings.DEBUG)
     c.client.auth_token = request.user.token.id
     c.client.management_url = cinder_url
+    connection_pool.attach(c.client, '_session', cinder_url)
     return c
 
 
@@ -245,15 +248,20 @@ def volume_create(request, size, name, description, volume_type,
     data = _replace_v2_parameters(data)
 
     volume = cinderclient(request).volumes.create(size, **data)
+    _tenant_absolute_limits.invalidate()
     return Volume(volume)
 
 
 def volume_extend(request, volume_id, new_size):
-    return cinderclient(request).volumes.extend(volume_id, new_size)
+    result = cinderclient(request).volumes.extend(volume_id, new_size)
+    _tenant_absolute_limits.invalidate()
+    return result
 
 
 def volume_delete(request, volume_id):
-    return cinderclient(request).volumes.delete(volume_id)
+    result = cinderclient(request).volumes.delete(volume_id)
+    _tenant_absolute_limits.invalidate()
+    return result
 
 
 def volume_retype(request, volume_id, new_type, migration_policy):
@@ -318,12 +326,16 @@ def volume_snapshot_create(request, volume_id, name,
             'force': force}
     data = _replace_v2_parameters(data)
 
-    return VolumeSnapshot(cinderclient(request).volume_snapshots.create(
-        volume_id, **data))
+    snapshot = cinderclient(request).volume_snapshots.create(volume_id,
+                                                             **data)
+    _tenant_absolute_limits.invalidate()
+    return VolumeSnapshot(snapshot)
 
 
 def volume_snapshot_delete(request, snapshot_id):
-    return cinderclient(request).volume_snapshots.delete(snapshot_id)
+    result = cinderclient(request).volume_snapshots.delete(snapshot_id)
+    _tenant_absolute_limits.invalidate()
+    return result
 
 
 def volume_snapshot_update(request, snapshot_id, name, description):
@@ -373,16 +385,21 @@ def volume_backup_create(request,
         container=container_name,
         name=name,
         description=description)
+    _tenant_absolute_limits.invalidate()
     return VolumeBackup(backup)
 
 
 def volume_backup_delete(request, backup_id):
-    return cinderclient(request).backups.delete(backup_id)
+    result = cinderclient(request).backups.delete(backup_id)
+    _tenant_absolute_limits.invalidate()
+    return result
 
 
 def volume_backup_restore(request, backup_id, volume_id):
-    return cinderclient(request).restores.restore(backup_id=backup_id,
-                                                  volume_id=volume_id)
+    result = cinderclient(request).restores.restore(backup_id=backup_id,
+                                                    volume_id=volume_id)
+    _tenant_absolute_limits.invalidate()
+    return result
 
 
 def volume_manage(request,
@@ -396,7 +413,7 @@ def volume_manage(request,
                   metadata,
                   bootable):
     source = {id_type: identifier}
-    return cinderclient(request).volumes.manage(
+    result = cinderclient(request).volumes.manage(
         host=host,
         ref=source,
         name=name,
@@ -405,10 +422,14 @@ def volume_manage(request,
         availability_zone=availability_zone,
         metadata=metadata,
         bootable=bootable)
+    _tenant_absolute_limits.invalidate()
+    return result
 
 
 def volume_unmanage(request, volume_id):
-    return cinderclient(request).volumes.unmanage(volume=volume_id)
+    result = cinderclient(request).volumes.unmanage(volume=volume_id)
+    _tenant_absolute_limits.invalidate()
+    return result
 
 
 def tenant_quota_get(request, tenant_id):
@@ -419,7 +440,9 @@ def tenant_quota_get(request, tenant_id):
 
 
 def tenant_quota_update(request, tenant_id, **kwargs):
-    return cinderclient(request).quotas.update(tenant_id, **kwargs)
+    result = cinderclient(request).quotas.update(tenant_id, **kwargs)
+    _tenant_absolute_limits.invalidate()
+    return result
 
 
 def default_quota_get(request, tenant_id):
@@ -450,6 +473,7 @@ def volume_type_list_with_qos_associations(request):
 
 def default_quota_update(request, **kwargs):
     cinderclient(request).quota_classes.update(DEFAULT_QUOTA_NAME, **kwargs)
+    _tenant_absolute_limits.invalidate()
 
 
 def volume_type_list(request):
@@ -551,8 +575,9 @@ def qos_spec_get_associations(request, qos_spec_id):
     return cinderclient(request).qos_specs.get_associations(qos_spec_id)
 
 
-@memoized
-def tenant_absolute_limits(request):
+@memoized_with_ttl('cinder.tenant_absolute_limits',
+                   base.cache_scope('volumev2'), timeout=60)
+def _tenant_absolute_limits(request):
     limits = cinderclient(request).limits.get().absolute
     limits_dict = {}
     for limit in limits:
@@ -571,6 +596,11 @@ def tenant_absolute_limits(request):
     return limits_dict
 
 
+@memoized
+def tenant_absolute_limits(request):
+    return _tenant_absolute_limits(request)
+
+
 def service_list(request):
     return cinderclient(request).services.list()
 
@@ -579,7 +609,16 @@ def availability_zone_list(request, detailed=False):
     return cinderclient(request).availability_zones.list(detailed=detailed)
 
 
+def _load_extensions(extensions_info, request):
+    manager = cinder_list_extensions.ListExtManager(cinderclient(request))
+    return [cinder_list_extensions.ListExtResource(manager, info, loaded=True)
+            for info in extensions_info]
+
+
 @memoized
+@memoized_with_ttl('cinder.list_extensions', base.cache_scope('volumev2'),
+                   timeout=3600, dump=base.resources_to_info,
+                   load=_load_extensions)
 def list_extensions(request):
     return cinder_list_extensions.ListExtManager(cinderclient(request))\
         .show_all()
@@ -616,7 +655,9 @@ def transfer_create(request, transfer_id, name):
 
 
 def transfer_accept(request, transfer_id, auth_key):
-    return cinderclient(request).transfers.accept(transfer_id, auth_key)
+    result = cinderclient(request).transfers.accept(transfer_id, auth_key)
+    _tenant_absolute_limits.invalidate()
+    return result
 
 
 def transfer_delete(request, transfer_id):
@@ -0,0 +1,158 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Worker-wide pool of keep-alive HTTP connections to the OpenStack APIs.
+
+The API clients are created for every Django request since they carry the
+user's token. Left alone, each of them opens its own connections, so every
+page pays for new TCP connections and TLS handshakes. This module keeps one
+``requests`` transport adapter per endpoint host and TLS settings
+(``OPENSTACK_SSL_CACERT`` and ``OPENSTACK_SSL_NO_VERIFY``) for the whole
+process. :func:`attach` mounts it on the requests session used by a freshly
+built client so that the client borrows the pooled connections.
+
+The ``API_CONNECTION_POOL`` setting controls the pool::
+
+    API_CONNECTION_POOL = {
+        'enabled': True,
+        'max_size': 10,       # connections kept per endpoint host
+        'idle_timeout': 60,   # seconds after which idle connections are
+                              # dropped instead of being reused
+    }
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+import requests
+from requests import adapters
+import six
+import six.moves.urllib.parse as urlparse
+
+
+LOG = logging.getLogger(__name__)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_config():
+    config = {'enabled': True,
+              'max_size': 10,
+              'idle_timeout': 60}
+    config.update(getattr(settings, 'API_CONNECTION_POOL', {}))
+    return config
+
+
+class EndpointPool(object):
+    """Keep-alive connections to a single endpoint host."""
+
+    def __init__(self, key, max_size, idle_timeout):
+        self.key = key
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.adapter = self._create_adapter()
+        self.last_used = time.time()
+        self.borrowed = 0
+        self.expired = 0
+
+    def _create_adapter(self):
+        return adapters.HTTPAdapter(pool_connections=1,
+                                    pool_maxsize=self.max_size)
+
+    def borrow(self):
+        """Return the adapter, replacing it if it has been idle too long."""
+        now = time.time()
+        if self.idle_timeout and now - self.last_used > self.idle_timeout:
+            # The server has most likely closed the connections already.
+            self.adapter.close()
+            self.adapter = self._create_adapter()
+            self.expired += 1
+        self.last_used = now
+        self.borrowed += 1
+        return self.adapter
+
+    def stats(self):
+        return {'borrowed': self.borrowed,
+                'expired': self.expired,
+                'max_size': self.max_size,
+                'idle': int(time.time() - self.last_used)}
+
+
+def _get_pool(url):
+    parsed = urlparse.urlsplit(url)
+    prefix = '%s://%s' % (parsed.scheme, parsed.netloc)
+    key = (prefix,
+           getattr(settings, 'OPENSTACK_SSL_CACERT', None),
+           getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            config = get_config()
+            pool = EndpointPool(key, config['max_size'],
+                                config['idle_timeout'])
+            _pools[key] = pool
+            LOG.debug("Created a connection pool for %s.", prefix)
+        return prefix, pool.borrow()
+
+
+def get_session(url, session=None):
+    """Return a requests session using the pooled connections for ``url``.
+
+    A new session is created unless an existing one is given.
+    """
+    if session is None:
+        session = requests.Session()
+    if url and get_config()['enabled']:
+        prefix, adapter = _get_pool(url)
+        session.mount(prefix, adapter)
+    return session
+
+
+def attach(obj, attr, url):
+    """Make the client attribute ``obj.attr`` use the pooled connections.
+
+    ``obj.attr`` is expected to hold the requests session (or a keystone
+    session wrapping one) used by a client. If it is ``None`` a new session
+    is assigned to it. ``attr`` can also be a tuple of the names the
+    attribute has in different client versions, the first one holding a
+    session is used. Returns whether the pool was attached; clients which
+    do not have such an attribute are left untouched.
+    """
+    names = (attr,) if isinstance(attr, six.string_types) else tuple(attr)
+    for name in names:
+        try:
+            session = getattr(obj, name)
+            # keystoneclient sessions wrap the requests session.
+            session = getattr(session, 'session', session)
+        except Exception:
+            # The attribute differs between client versions, mocked clients
+            # raise their own errors.
+            continue
+        if session is None:
+            setattr(obj, name, get_session(url))
+            return True
+        elif isinstance(session, requests.Session):
+            get_session(url, session=session)
+            return True
+    LOG.debug("Connections to %s are not pooled, %r has no session in %s.",
+              url, obj, ", ".join(names))
+    return False
+
+
+def stats():
+    """Return the usage of the pool of every endpoint host."""
+    with _pools_lock:
+        return dict(('%s (cacert=%s, insecure=%s)' % key, pool.stats())
+                    for key, pool in _pools.items())
@@ -23,24 +23,30 @@ import itertools
 import json
 import logging
 import os
+import threading
 
 
 from django.conf import settings
-from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
 from django.core.files.uploadedfile import TemporaryUploadedFile
 
 
 import glanceclient as glance_client
-from six.moves import _thread as thread
+from glanceclient.v1 import images as v1_images
 
+from horizon.utils import concurrency
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils.memoized import memoized_with_ttl  # noqa
 from openstack_dashboard.api import base
+from openstack_dashboard.api import connection_pool
 
 
 LOG = logging.getLogger(__name__)
 VERSIONS = base.APIVersionManager("image", preferred_version=2)
+# The upload progress is saved every UPLOAD_PROGRESS_STEP bytes.
+UPLOAD_PROGRESS_STEP = 8 * 1024 * 1024
+UPLOAD_PROGRESS_TIMEOUT = 24 * 3600
 
 
 @memoized
@@ -48,12 +54,16 @@ def glanceclient(request, version='1'):
     url = base.url_for(request, 'image')
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    return glance_client.Client(version, url, token=request.user.token.id,
-                                insecure=insecure, cacert=cacert)
+    c = glance_client.Client(version, url, token=request.user.token.id,
+                             insecure=insecure, cacert=cacert)
+    connection_pool.attach(getattr(c, 'http_client', None), 'session', url)
+    return c
 
 
 def image_delete(request, image_id):
-    return glanceclient(request).images.delete(image_id)
+    result = glanceclient(request).images.delete(image_id)
+    public_image_list.invalidate()
+    return result
 
 
 def image_get(request, image_id):
@@ -107,11 +117,40 @@ def image_list_detailed(request, marker=None, sort_dir='desc',
     return (images, has_more_data, has_prev_data)
 
 
+def _public_images_scope(request):
+    # Public images are the same for every project, so they are shared by
+    # all the tokens talking to the same endpoint.
+    return (request.user.services_region, base.url_for(request, 'image'))
+
+
+def _load_images(images_info, request):
+    manager = glanceclient(request).images
+    return [v1_images.Image(manager, info, loaded=True)
+            for info in images_info]
+
+
+@memoized_with_ttl('glance.public_image_list', _public_images_scope,
+                   timeout=60, dump=base.resources_to_info, load=_load_images,
+                   chunk_size=200)
+def public_image_list(request):
+    """Returns the active public images.
+
+    The list is cached across requests and invalidated by the image create,
+    update and delete calls. It is stored in chunks of 200 images, since a
+    large catalog would not fit in a single memcached item.
+    """
+    images, _more, _prev = image_list_detailed(
+        request, filters={"is_public": True, "status": "active"})
+    return images
+
+
 def image_update(request, image_id, **kwargs):
     image_data = kwargs.get('data', None)
     try:
         return glanceclient(request).images.update(image_id, **kwargs)
     finally:
+        # Also after an upload, which makes the image active.
+        public_image_list.invalidate()
         if image_data:
             try:
                 os.remove(image_data.file.name)
@@ -125,6 +164,72 @@ def image_update(request, image_id, **kwargs):
                 LOG.warn(msg)
 
 
+class _ProgressReader(object):
+    """Wraps the file of an image upload, recording how much has been read.
+
+    The progress is stored in Django's cache, see
+    :func:`image_upload_progress`.
+    """
+
+    def __init__(self, data, image_id):
+        self._data = data
+        self.image_id = image_id
+        self.bytes_read = 0
+        self._saved = 0
+        self._save()
+
+    def __getattr__(self, name):
+        return getattr(self._data, name)
+
+    def _save(self):
+        cache.set(_upload_progress_key(self.image_id),
+                  (self.bytes_read, self._data.size),
+                  UPLOAD_PROGRESS_TIMEOUT)
+        self._saved = self.bytes_read
+
+    def read(self, *args):
+        chunk = self._data.read(*args)
+        self.bytes_read += len(chunk)
+        if (not chunk or self.bytes_read >= self._data.size or
+                self.bytes_read - self._saved >= UPLOAD_PROGRESS_STEP):
+            self._save()
+        return chunk
+
+
+def _upload_progress_key(image_id):
+    return 'glance.image_upload:%s' % image_id
+
+
+def image_upload_progress(request, image_id):
+    """Returns the progress of a local image upload started by Horizon.
+
+    :returns: a ``(bytes_uploaded, image_size)`` tuple, or ``None`` when no
+              upload of the image is known to this Horizon
+    """
+    return cache.get(_upload_progress_key(image_id))
+
+
+_upload_executor = None
+_upload_executor_lock = threading.Lock()
+
+
+def _get_upload_executor():
+    global _upload_executor
+    with _upload_executor_lock:
+        if _upload_executor is None:
+            max_workers = getattr(settings, 'HORIZON_IMAGES_UPLOAD_WORKERS',
+                                  4)
+            _upload_executor = concurrency.BackgroundExecutor(max_workers)
+        return _upload_executor
+
+
+def _upload_image_data(request, image_id, data):
+    try:
+        image_update(request, image_id, data=data, purge_props=False)
+    except Exception:
+        LOG.exception("Failed to upload the data of image %s.", image_id)
+
+
 def image_create(request, **kwargs):
     """Create image.
 
@@ -139,26 +244,29 @@ def image_create(request, **kwargs):
     asynchronously.
 
     In the case of 'data' the process of uploading the data may take
-    some time and is handed off to a seperate thread.
+    some time. Files which Django spooled to disk are handed off to a
+    bounded pool of background uploaders, the small files it keeps in
+    memory are uploaded right away. The progress of the upload is
+    available from image_upload_progress.
     """
     data = kwargs.pop('data', None)
 
     image = glanceclient(request).images.create(**kwargs)
+    public_image_list.invalidate()
 
     if data:
         if isinstance(data, TemporaryUploadedFile):
             # Hack to fool Django, so we can keep file open in the new thread.
             data.file.close_called = True
-        if isinstance(data, InMemoryUploadedFile):
-            # Clone a new file for InMemeoryUploadedFile.
-            # Because the old one will be closed by Django.
-            data = SimpleUploadedFile(data.name,
-                                      data.read(),
-                                      data.content_type)
-        thread.start_new_thread(image_update,
-                                (request, image.id),
-                                {'data': data,
-                                 'purge_props': False})
+            _get_upload_executor().submit(
+                'image_upload:%s' % image.id, _upload_image_data,
+                request, image.id, _ProgressReader(data, image.id))
+        else:
+            # Django closes in-memory files at the end of the request, they
+            # are small enough to be uploaded before then.
+            image_update(request, image.id,
+                         data=_ProgressReader(data, image.id),
+                         purge_props=False)
 
     return image
 
@@ -31,9 +31,11 @@ from openstack_auth import utils as auth_utils
 
 from horizon import exceptions
 from horizon import messages
+from horizon.utils import concurrency
 from horizon.utils import functions as utils
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import connection_pool
 from openstack_dashboard import policy
 
 
@@ -175,6 +177,7 @@ def keystoneclient(request, admin=False):
                                             cacert=cacert,
                                             auth_url=endpoint,
                                             debug=settings.DEBUG)
+        connection_pool.attach(conn, 'session', endpoint)
         setattr(request, cache_attr, conn)
     return conn
 
@@ -583,24 +586,45 @@ def remove_domain_user_role(request, user, role, domain=None):
 
 
 def get_project_users_roles(request, project):
-    users_roles = collections.defaultdict(list)
     if VERSIONS.active < 3:
+        users_roles = collections.defaultdict(list)
         project_users = user_list(request, project=project)
-
-        for user in project_users:
-            roles = roles_for_user(request, user.id, project)
-            roles_ids = [role.id for role in roles]
+        with concurrency.RequestExecutor() as executor:
+            futures = executor.map(
+                'roles_for_user',
+                lambda user: roles_for_user(request, user.id, project),
+                project_users)
+        for user, future in zip(project_users, futures):
+            roles_ids = [role.id for role in future.result()]
             users_roles[user.id].extend(roles_ids)
-    else:
-        project_role_assignments = role_assignments_list(request,
-                                                         project=project)
-        for role_assignment in project_role_assignments:
-            if not hasattr(role_assignment, 'user'):
-                continue
-            user_id = role_assignment.user['id']
-            role_id = role_assignment.role['id']
-            users_roles[user_id].append(role_id)
-    return users_roles
+        return users_roles
+    return get_project_role_assignments(request, project)[0]
+
+
+def get_project_role_assignments(request, project):
+    """Gets the users roles and the groups roles in a given project.
+
+    Both are read from a single role assignments listing of the project.
+    Groups aren't available with Keystone v2, the groups roles are empty
+    then.
+
+    :returns: a ``(users_roles, groups_roles)`` tuple of dictionaries
+              mapping the users, respectively the groups, to their roles in
+              the given project
+    """
+    if VERSIONS.active < 3:
+        return get_project_users_roles(request, project), {}
+    users_roles = collections.defaultdict(list)
+    groups_roles = collections.defaultdict(list)
+    project_role_assignments = role_assignments_list(request,
+                                                     project=project)
+    for role_assignment in project_role_assignments:
+        role_id = role_assignment.role['id']
+        if hasattr(role_assignment, 'user'):
+            users_roles[role_assignment.user['id']].append(role_id)
+        elif hasattr(role_assignment, 'group'):
+            groups_roles[role_assignment.group['id']].append(role_id)
+    return users_roles, groups_roles
 
 
 def add_tenant_user_role(request, project=None, user=None, role=None,
@@ -26,13 +26,17 @@ import netaddr
 
 from django.conf import settings
 from django.utils.datastructures import SortedDict
+from django.utils.http import urlquote
 from django.utils.translation import ugettext_lazy as _
 from neutronclient.common import exceptions as neutron_exc
 from neutronclient.v2_0 import client as neutron_client
 
 from horizon import messages
+from horizon.utils import concurrency
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils.memoized import memoized_with_ttl  # noqa
 from openstack_dashboard.api import base
+from openstack_dashboard.api import connection_pool
 from openstack_dashboard.api import network_base
 from openstack_dashboard.api import nova
 from openstack_dashboard import policy
@@ -50,6 +54,10 @@ ROUTER_INTERFACE_OWNERS = (
     'network:router_interface_distributed'
 )
 
+# Part of the maximum URI length kept for the endpoint, the resource path
+# and the query parameters other than the filter being split.
+URI_LENGTH_RESERVED = 1024
+
 
 class NeutronAPIDictWrapper(base.APIDictWrapper):
 
@@ -95,7 +103,9 @@ class Network(NeutronAPIDictWrapper):
 
     def to_dict(self):
         d = dict(super(NeutronAPIDictWrapper, self).to_dict())
-        d['subnets'] = [s.to_dict() for s in d['subnets']]
+        # Subnets are left as ids when network_list() does not expand them.
+        d['subnets'] = [s.to_dict() if isinstance(s, Subnet) else s
+                        for s in d['subnets']]
         return d
 
 
@@ -448,8 +458,10 @@ class FloatingIpManager(network_base.FloatingIpManager):
                                     and (p.device_id in gw_routers))])
         # we have to include any shared subnets as well because we may not
         # have permission to see the router interface to infer connectivity
-        shared = set([s.id for n in network_list(self.request, shared=True)
-                      for s in n.subnets])
+        shared = set([subnet_id for n in network_list(self.request,
+                                                      expand_subnets=False,
+                                                      shared=True)
+                      for subnet_id in n.subnets])
         return reachable_subnets | shared
 
     def list_targets(self):
@@ -540,35 +552,41 @@ def get_ipver_str(ip_version):
 def neutronclient(request):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
+    endpoint_url = base.url_for(request, 'network')
     c = neutron_client.Client(token=request.user.token.id,
                               auth_url=base.url_for(request, 'identity'),
-                              endpoint_url=base.url_for(request, 'network'),
+                              endpoint_url=endpoint_url,
                               insecure=insecure, ca_cert=cacert)
+    connection_pool.attach(getattr(c, 'httpclient', None), 'session',
+                           endpoint_url)
     return c
 
 
-def list_resources_with_long_filters(list_method,
-                                     filter_attr, filter_values, **params):
-    """List neutron resources with handling RequestURITooLong exception.
-
-    If filter parameters are long, list resources API request leads to
-    414 error (URL is too long). For such case, this method split
-    list parameters specified by a list_field argument into chunks
-    and call the specified list_method repeatedly.
+def _split_filter_values(filter_attr, filter_values, max_filter_len):
+    """Split filter values into chunks which fit into a single request.
 
-    :param list_method: Method used to retrieve resource list.
-    :param filter_attr: attribute name to be filtered. The value corresponding
-        to this attribute is specified by "filter_values".
-        If you want to specify more attributes for a filter condition,
-        pass them as keyword arguments like "attr2=values2".
-    :param filter_values: values of "filter_attr" to be filtered.
-        If filter_values are too long and the total URI length exceed the
-        maximum length supported by the neutron server, filter_values will
-        be split into sub lists if filter_values is a list.
-    :param params: parameters to pass a specified listing API call
-        without any changes. You can specify more filter conditions
-        in addition to a pair of filter_attr and filter_values.
+    Each value takes ``len('<filter_attr>=<quoted value>&')`` characters
+    in the query string.
     """
+    chunks = []
+    chunk = []
+    chunk_len = 0
+    for value in filter_values:
+        value_len = len(filter_attr) + len(urlquote(value, safe='')) + 2
+        if chunk and chunk_len + value_len > max_filter_len:
+            chunks.append(chunk)
+            chunk = []
+            chunk_len = 0
+        chunk.append(value)
+        chunk_len += value_len
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _list_resources_with_filter_chunk(list_method, filter_attr, filter_values,
+                                      params):
+    params = dict(params)
     try:
         params[filter_attr] = filter_values
         return list_method(**params)
@@ -601,11 +619,81 @@ def list_resources_with_long_filters(list_method,
         return resources
 
 
-def network_list(request, **params):
+def list_resources_with_long_filters(list_method,
+                                     filter_attr, filter_values, **params):
+    """List neutron resources with handling RequestURITooLong exception.
+
+    If filter parameters are long, list resources API request leads to
+    414 error (URL is too long). To avoid it, list parameters specified by
+    a list_field argument are split into chunks based on the
+    ``max_uri_length`` option of ``OPENSTACK_NEUTRON_NETWORK`` and the
+    chunks are listed concurrently. If a request is still rejected as too
+    long, its values are split again using the excess length reported by
+    the neutron server.
+
+    :param list_method: Method used to retrieve resource list.
+    :param filter_attr: attribute name to be filtered. The value corresponding
+        to this attribute is specified by "filter_values".
+        If you want to specify more attributes for a filter condition,
+        pass them as keyword arguments like "attr2=values2".
+    :param filter_values: values of "filter_attr" to be filtered.
+        If filter_values are too long and the total URI length exceed the
+        maximum length supported by the neutron server, filter_values will
+        be split into sub lists if filter_values is a list.
+    :param params: parameters to pass a specified listing API call
+        without any changes. You can specify more filter conditions
+        in addition to a pair of filter_attr and filter_values.
+    """
+    chunks = []
+    if isinstance(filter_values, (list, tuple, set, frozenset)):
+        network_config = getattr(settings, 'OPENSTACK_NEUTRON_NETWORK', {})
+        max_filter_len = (network_config.get('max_uri_length', 8192) -
+                          URI_LENGTH_RESERVED)
+        chunks = _split_filter_values(filter_attr, filter_values,
+                                      max_filter_len)
+    if len(chunks) <= 1:
+        return _list_resources_with_filter_chunk(list_method, filter_attr,
+                                                 filter_values, params)
+
+    with concurrency.RequestExecutor() as executor:
+        futures = executor.map(
+            'list_resources_with_long_filters',
+            lambda chunk: _list_resources_with_filter_chunk(
+                list_method, filter_attr, chunk, params),
+            chunks)
+    resources = []
+    for future in futures:
+        resources.extend(future.result())
+    return resources
+
+
+def network_list(request, expand_subnets=True, **params):
+    """Return a list of networks.
+
+    :param expand_subnets: controls how the ``subnets`` attribute of the
+        returned networks is populated.
+        ``True`` (the default) expands subnet ids into :class:`Subnet`
+        objects using a single listing of all subnets.
+        ``'referenced'`` does the same but only lists the subnets
+        referenced by the returned networks, which is cheaper when they
+        are few compared to all the subnets visible to the user.
+        ``False`` skips the subnet listing and leaves ``subnets`` as the
+        list of subnet ids returned by Neutron.
+    """
     LOG.debug("network_list(): params=%s", params)
     networks = neutronclient(request).list_networks(**params).get('networks')
+    if not expand_subnets:
+        return [Network(n) for n in networks]
     # Get subnet list to expand subnet info in network list.
-    subnets = subnet_list(request)
+    if expand_subnets == 'referenced':
+        subnet_ids = sorted(set(s for n in networks
+                                for s in n.get('subnets', [])))
+        subnets = []
+        if subnet_ids:
+            subnets = list_resources_with_long_filters(
+                subnet_list, 'id', subnet_ids, request=request)
+    else:
+        subnets = subnet_list(request)
     subnet_dict = dict([(s['id'], s) for s in subnets])
     # Expand subnet list from subnet_id to values.
     for n in networks:
@@ -999,7 +1087,7 @@ def servers_update_addresses(request, servers, all_tenants=False):
             floating_ips = []
         networks = list_resources_with_long_filters(
             network_list, 'id', set([port.network_id for port in ports]),
-            request=request)
+            request=request, expand_subnets=False)
     except Exception:
         error_message = _('Unable to connect to Neutron.')
         LOG.error(error_message)
@@ -1068,6 +1156,8 @@ def _server_get_addresses(request, server, ports, floating_ips, network_names):
 
 
 @memoized
+@memoized_with_ttl('neutron.list_extensions', base.cache_scope('network'),
+                   timeout=3600)
 def list_extensions(request):
     extensions_list = neutronclient(request).list_extensions()
     if 'extensions' in extensions_list:
@@ -30,15 +30,19 @@ from novaclient import exceptions as nova_exceptions
 from novaclient.v2 import client as nova_client
 from novaclient.v2.contrib import instance_action as nova_instance_action
 from novaclient.v2.contrib import list_extensions as nova_list_extensions
+from novaclient.v2 import flavors as nova_flavors
 from novaclient.v2 import security_group_rules as nova_rules
 from novaclient.v2 import security_groups as nova_security_groups
 from novaclient.v2 import servers as nova_servers
 
 from horizon import conf
+from horizon.utils import concurrency
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils.memoized import memoized_with_ttl  # noqa
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import connection_pool
 from openstack_dashboard.api import network_base
 
 
@@ -100,24 +104,22 @@ class Server(base.APIResourceWrapper):
         super(Server, self).__init__(apiresource)
         self.request = request
 
-    # TODO(gabriel): deprecate making a call to Glance as a fallback.
     @property
     def image_name(self):
-        import glanceclient.exc as glance_exceptions  # noqa
-        from openstack_dashboard.api import glance  # noqa
-
         if not self.image:
             return _("-")
         if hasattr(self.image, 'name'):
             return self.image.name
         if 'name' in self.image:
             return self.image['name']
-        else:
-            try:
-                image = glance.image_get(self.request, self.image['id'])
-                return image.name
-            except glance_exceptions.ClientException:
-                return _("-")
+        # Resolve the images of every server listed along with this one at
+        # once rather than asking Glance for each of them in turn.
+        servers = getattr(self, '_image_batch', None) or [self]
+        images = servers_resolve_images(self.request, servers)
+        image = images.get(self.image.get('id'))
+        if image is None:
+            return _("-")
+        return image.name
 
     @property
     def internal_name(self):
@@ -452,6 +454,7 @@ def novaclient(request):
                            http_log_debug=settings.DEBUG)
     c.client.auth_token = request.user.token.id
     c.client.management_url = base.url_for(request, 'compute')
+    connection_pool.attach(c.client, '_session', c.client.management_url)
     return c
 
 
@@ -481,6 +484,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                                                 flavorid=flavorid,
                                                 ephemeral=ephemeral,
                                                 swap=swap, is_public=is_public)
+    _flavor_list.invalidate()
     if (metadata):
         flavor_extra_set(request, flavor.id, metadata)
     return flavor
@@ -488,6 +492,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
 
 def flavor_delete(request, flavor_id):
     novaclient(request).flavors.delete(flavor_id)
+    _flavor_list.invalidate()
 
 
 def flavor_get(request, flavor_id, get_extras=False):
@@ -497,10 +502,23 @@ def flavor_get(request, flavor_id, get_extras=False):
     return flavor
 
 
+def _load_flavors(flavors_info, request, *args, **kwargs):
+    manager = novaclient(request).flavors
+    return [nova_flavors.Flavor(manager, info, loaded=True)
+            for info in flavors_info]
+
+
+@memoized_with_ttl('nova.flavor_list', base.cache_scope('compute'),
+                   timeout=600, dump=base.resources_to_info,
+                   load=_load_flavors)
+def _flavor_list(request, is_public=True):
+    return novaclient(request).flavors.list(is_public=is_public)
+
+
 @memoized
 def flavor_list(request, is_public=True, get_extras=False):
     """Get the list of available instance sizes (flavors)."""
-    flavors = novaclient(request).flavors.list(is_public=is_public)
+    flavors = _flavor_list(request, is_public=is_public)
     if get_extras:
         for flavor in flavors:
             flavor.extras = flavor_get_extras(request, flavor.id, True, flavor)
@@ -515,14 +533,18 @@ def flavor_access_list(request, flavor=None):
 
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
-    return novaclient(request).flavor_access.add_tenant_access(
+    access = novaclient(request).flavor_access.add_tenant_access(
         flavor=flavor, tenant=tenant)
+    _flavor_list.invalidate()
+    return access
 
 
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
-    return novaclient(request).flavor_access.remove_tenant_access(
+    access = novaclient(request).flavor_access.remove_tenant_access(
         flavor=flavor, tenant=tenant)
+    _flavor_list.invalidate()
+    return access
 
 
 def flavor_get_extras(request, flavor_id, raw=False, flavor=None):
@@ -615,6 +637,8 @@ def server_list(request, search_opts=None, all_tenants=False):
         search_opts['project_id'] = request.user.tenant_id
     servers = [Server(s, request)
                for s in c.servers.list(True, search_opts)]
+    for server in servers:
+        server._image_batch = servers
 
     has_more_data = False
     if paginate and len(servers) > page_size:
@@ -626,6 +650,53 @@ def server_list(request, search_opts=None, all_tenants=False):
     return (servers, has_more_data)
 
 
+def _request_images(request):
+    """Return the images resolved so far while handling ``request``."""
+    images = getattr(request, '_server_images', None)
+    if images is None:
+        images = {}
+        try:
+            request._server_images = images
+        except AttributeError:
+            pass
+    return images
+
+
+def servers_resolve_images(request, servers):
+    """Fetch the images the given servers were booted from.
+
+    Returns a dictionary mapping image ids to the images. The images are
+    kept for the rest of the request, only the ones not seen yet are fetched
+    from Glance, concurrently. Images which cannot be retrieved (e.g. they
+    have been deleted since) map to ``None``.
+    """
+    import glanceclient.exc as glance_exceptions  # noqa
+    from openstack_dashboard.api import glance  # noqa
+
+    images = _request_images(request)
+    missing = set()
+    for server in servers:
+        image = server.image
+        if (image and not hasattr(image, 'name') and 'name' not in image
+                and image.get('id') and image['id'] not in images):
+            missing.add(image['id'])
+    if not missing:
+        return images
+
+    def image_get(image_id):
+        try:
+            return glance.image_get(request, image_id)
+        except glance_exceptions.ClientException:
+            return None
+
+    missing = sorted(missing)
+    with concurrency.RequestExecutor() as executor:
+        futures = executor.map('image_get', image_get, missing)
+    for image_id, future in zip(missing, futures):
+        images[image_id] = future.result()
+    return images
+
+
 def server_console_output(request, instance_id, tail_length=None):
     """Gets console output of an instance."""
     return novaclient(request).servers.get_console_output(instance_id,
@@ -933,7 +1004,16 @@ def interface_detach(request, server, port_id):
     return novaclient(request).servers.interface_detach(server, port_id)
 
 
+def _load_extensions(extensions_info, request):
+    manager = nova_list_extensions.ListExtManager(novaclient(request))
+    return [nova_list_extensions.ListExtResource(manager, info, loaded=True)
+            for info in extensions_info]
+
+
 @memoized
+@memoized_with_ttl('nova.list_extensions', base.cache_scope('compute'),
+                   timeout=3600, dump=base.resources_to_info,
+                   load=_load_extensions)
 def list_extensions(request):
     """List all nova extensions, except the ones in the blacklist."""
 
@@ -16,9 +16,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
+import json
 import logging
+import time
 
 from oslo_utils import timeutils
+import six
 import six.moves.urllib.parse as urlparse
 import swiftclient
 
@@ -29,10 +33,14 @@ from horizon import exceptions
 from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import connection_pool
 
 
 LOG = logging.getLogger(__name__)
 FOLDER_DELIMITER = "/"
+# The largest number of objects Swift returns in a single listing.
+LISTING_PAGE_LIMIT = 10000
+FILTER_SCAN_LIMIT = 10000
 CHUNK_SIZE = getattr(settings, 'SWIFT_FILE_TRANSFER_CHUNK_SIZE', 512 * 1024)
 # Swift ACL
 GLOBAL_READ_ACL = ".r:*"
@@ -111,7 +119,7 @@ def swift_api(request):
     endpoint = base.url_for(request, 'object-store')
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-    return swiftclient.client.Connection(None,
+    conn = swiftclient.client.Connection(None,
                                          request.user.username,
                                          None,
                                          preauthtoken=request.user.token.id,
@@ -119,6 +127,14 @@ def swift_api(request):
                                          cacert=cacert,
                                          insecure=insecure,
                                          auth_version="2.0")
+    # Create the HTTP connection up front so that it uses pooled sockets.
+    http_conn = swiftclient.client.http_connection(endpoint, cacert=cacert,
+                                                   insecure=insecure)
+    # The session attribute was renamed in some swiftclient versions.
+    connection_pool.attach(http_conn[1],
+                           ('request_session', 'requests_session'), endpoint)
+    conn.http_conn = http_conn
+    return conn
 
 
 def swift_container_exists(request, container_name):
@@ -209,16 +225,36 @@ def swift_delete_container(request, name):
     return True
 
 
+def _iter_objects(request, container_name, prefix=None, marker=None,
+                  page_size=None):
+    """Yields the listing of a container, one page of it at a time.
+
+    The pages are requested with markers as they are consumed, so the
+    caller only downloads as much of the listing as it reads.
+    """
+    page_size = min(page_size or LISTING_PAGE_LIMIT, LISTING_PAGE_LIMIT)
+    while True:
+        headers, objects = swift_api(request).get_container(
+            container_name,
+            prefix=prefix,
+            marker=marker,
+            limit=page_size,
+            delimiter=FOLDER_DELIMITER)
+        for item in objects:
+            yield item
+        if len(objects) < page_size:
+            return
+        last = objects[-1]
+        marker = last.get('name') or last.get('subdir')
+
+
 def swift_get_objects(request, container_name, prefix=None, marker=None,
                       limit=None):
     limit = limit or getattr(settings, 'API_RESULT_LIMIT', 1000)
-    kwargs = dict(prefix=prefix,
-                  marker=marker,
-                  limit=limit + 1,
-                  delimiter=FOLDER_DELIMITER,
-                  full_listing=True)
-    headers, objects = swift_api(request).get_container(container_name,
-                                                        **kwargs)
+    objects = list(itertools.islice(
+        _iter_objects(request, container_name, prefix=prefix,
+                      marker=marker, page_size=limit + 1),
+        limit + 1))
     object_objs = _objectify(objects, container_name)
 
     if(len(object_objs) > limit):
@@ -228,24 +264,24 @@ def swift_get_objects(request, container_name, prefix=None, marker=None,
 
 
 def swift_filter_objects(request, filter_string, container_name, prefix=None,
-                         marker=None):
-    # FIXME(kewu): Swift currently has no real filtering API, thus the marker
-    # parameter here won't actually help the pagination. For now I am just
-    # getting the largest number of objects from a container and filtering
-    # based on those objects.
-    limit = 9999
-    objects = swift_get_objects(request,
-                                container_name,
-                                prefix=prefix,
-                                marker=marker,
-                                limit=limit)
+                         marker=None, limit=None):
+    # Swift has no filtering API, so the listing is read page by page and
+    # filtered here until enough objects match. At most
+    # FILTER_SCAN_LIMIT objects are looked at.
+    limit = limit or getattr(settings, 'API_RESULT_LIMIT', 1000)
     filter_string_list = filter_string.lower().strip().split(' ')
 
-    def matches_filter(obj):
+    def matches_filter(item):
+        name = item.get('name') or item.get('subdir')
         for q in filter_string_list:
-            return wildcard_search(obj.name.lower(), q)
+            return wildcard_search(name.lower(), q)
 
-    return filter(matches_filter, objects[0])
+    objects = _iter_objects(request, container_name, prefix=prefix,
+                            marker=marker, page_size=limit)
+    objects = itertools.islice(objects, FILTER_SCAN_LIMIT)
+    matches = itertools.islice(six.moves.filter(matches_filter, objects),
+                               limit)
+    return _objectify(matches, container_name)
 
 
 def wildcard_search(string, q):
@@ -275,21 +311,85 @@ def swift_copy_object(request, orig_container_name, orig_object_name,
                                          headers=headers)
 
 
+def _upload_segments(request, container_name, object_name, object_file,
+                     size, segment_size, headers):
+    """Uploads a file as a large object, in segments of ``segment_size``.
+
+    The segments are stored in the ``<container>_segments`` container and
+    joined by a static large object manifest, or by a dynamic large object
+    one if ``SWIFT_USE_SLO`` is ``False``.
+    """
+    api = swift_api(request)
+    segment_container = '%s_segments' % container_name
+    api.put_container(segment_container)
+    use_slo = getattr(settings, 'SWIFT_USE_SLO', True)
+    prefix = '%s/%s%f/%d/%d/' % (object_name, 'slo/' if use_slo else '',
+                                 time.time(), size, segment_size)
+
+    manifest = []
+    offset = 0
+    while offset < size:
+        segment_name = '%s%08d' % (prefix, len(manifest))
+        segment_bytes = min(segment_size, size - offset)
+        # put_object reads at most content_length bytes, so each segment
+        # streams the next part of the file.
+        etag = api.put_object(segment_container,
+                              segment_name,
+                              object_file,
+                              content_length=segment_bytes,
+                              chunk_size=CHUNK_SIZE)
+        manifest.append({'path': '/%s/%s' % (segment_container,
+                                             segment_name),
+                         'etag': etag,
+                         'size_bytes': segment_bytes})
+        offset += segment_bytes
+
+    if use_slo:
+        return api.put_object(container_name,
+                              object_name,
+                              json.dumps(manifest),
+                              headers=headers,
+                              query_string='multipart-manifest=put')
+    headers = dict(headers, **{'X-Object-Manifest': '%s/%s' % (
+        segment_container, prefix)})
+    return api.put_object(container_name,
+                          object_name,
+                          '',
+                          content_length=0,
+                          headers=headers)
+
+
 def swift_upload_object(request, container_name, object_name,
                         object_file=None):
-    if swift_object_exists(request, container_name, object_name):
-        raise exceptions.AlreadyExists(object_name, 'object')
     headers = {}
     size = 0
     if object_file:
         headers['X-Object-Meta-Orig-Filename'] = object_file.name
         size = object_file.size
 
-    etag = swift_api(request).put_object(container_name,
-                                         object_name,
-                                         object_file,
-                                         content_length=size,
-                                         headers=headers)
+    segment_size = getattr(settings, 'SWIFT_SEGMENT_SIZE', 1024 ** 3)
+    if segment_size and size > segment_size:
+        # Don't upload all the segments to find out at the end that the
+        # manifest can't be created.
+        if swift_object_exists(request, container_name, object_name):
+            raise exceptions.AlreadyExists(object_name, 'object')
+        etag = _upload_segments(request, container_name, object_name,
+                                object_file, size, segment_size, headers)
+    else:
+        # Let Swift refuse to replace an existing object rather than
+        # checking for it with a separate request.
+        headers['If-None-Match'] = '*'
+        try:
+            etag = swift_api(request).put_object(container_name,
+                                                 object_name,
+                                                 object_file,
+                                                 content_length=size,
+                                                 chunk_size=CHUNK_SIZE,
+                                                 headers=headers)
+        except swiftclient.client.ClientException as e:
+            if e.http_status == 412:
+                raise exceptions.AlreadyExists(object_name, 'object')
+            raise
 
     obj_info = {'name': object_name, 'bytes': size, 'etag': etag}
     return StorageObject(obj_info, container_name)
@@ -0,0 +1,137 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Role changes of project membership updates.
+
+The project workflows compare the roles chosen in their membership steps
+with the current role assignments of the project, and only grant or revoke
+the roles which differ. The resulting calls don't depend on each other and
+are made concurrently.
+"""
+
+import collections
+import logging
+
+from horizon.utils import concurrency
+
+
+LOG = logging.getLogger(__name__)
+
+
+def get_requested_roles(data, member_step, available_roles):
+    """Returns the roles chosen in a membership step.
+
+    The result maps every user or group id chosen in the step to the list
+    of the ids of its roles.
+    """
+    requested = collections.OrderedDict()
+    for role in available_roles:
+        field_name = member_step.get_member_field_name(role.id)
+        for actor_id in data[field_name]:
+            requested.setdefault(actor_id, []).append(role.id)
+    return requested
+
+
+def get_offered_ids(member_step, available_roles):
+    """Returns the ids of the users or groups offered by a membership step."""
+    offered = set()
+    for role in available_roles:
+        field_name = member_step.get_member_field_name(role.id)
+        field = member_step.action.fields.get(field_name)
+        if field is not None:
+            offered.update(actor_id for actor_id, name in field.choices)
+    return offered
+
+
+def diff_roles(current, requested, actor_ids=None):
+    """Returns the roles to grant and to revoke to turn current into requested.
+
+    ``current`` and ``requested`` map user or group ids to lists of role
+    ids. Returns two ordered dictionaries mapping ids to the role ids to
+    grant, respectively to revoke. The current members come first.
+
+    When ``actor_ids`` is given, the current roles of the other users or
+    groups are left alone, e.g. those not offered by the membership step.
+    """
+    grants = collections.OrderedDict()
+    revokes = collections.OrderedDict()
+    for actor_id, role_ids in current.items():
+        if actor_ids is not None and actor_id not in actor_ids:
+            continue
+        requested_ids = requested.get(actor_id, ())
+        added = [role_id for role_id in requested_ids
+                 if role_id not in role_ids]
+        removed = [role_id for role_id in role_ids
+                   if role_id not in requested_ids]
+        if added:
+            grants[actor_id] = added
+        if removed:
+            revokes[actor_id] = removed
+    for actor_id, role_ids in requested.items():
+        if actor_id not in current:
+            grants[actor_id] = list(role_ids)
+    return grants, revokes
+
+
+class RoleChange(object):
+    """A single grant or revocation of a role.
+
+    ``func`` is one of the role functions of ``api.keystone``, it's called
+    with the request and ``kwargs``.
+    """
+
+    def __init__(self, name, func, **kwargs):
+        self.name = name
+        self.func = func
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        kwargs = ', '.join('%s=%s' % item
+                           for item in sorted(self.kwargs.items()))
+        return "<%s: %s(%s)>" % (self.__class__.__name__, self.name, kwargs)
+
+
+def get_role_changes(roles, name, func, actor_kwarg, **kwargs):
+    """Returns the :class:`RoleChange` objects for a roles dictionary.
+
+    ``roles`` maps user or group ids to role ids, as returned by
+    :func:`diff_roles`. The id of the user or group is passed to ``func``
+    as ``actor_kwarg``, along with the role and the extra ``kwargs``.
+    """
+    changes = []
+    for actor_id, role_ids in roles.items():
+        for role_id in role_ids:
+            change_kwargs = dict(kwargs, role=role_id)
+            change_kwargs[actor_kwarg] = actor_id
+            changes.append(RoleChange(name, func, **change_kwargs))
+    return changes
+
+
+def apply_role_changes(request, changes):
+    """Makes the given role changes concurrently.
+
+    Every change is attempted even if some of them fail. Returns the list
+    of the failed changes along with their
+    :class:`~horizon.utils.concurrency.Future`, whose ``result()`` raises
+    the error.
+    """
+    with concurrency.RequestExecutor() as executor:
+        futures = [executor.submit(change.name, change.func, request,
+                                   **change.kwargs)
+                   for change in changes]
+    failures = []
+    for change, future in zip(changes, futures):
+        exc = future.exception()
+        if exc is not None:
+            LOG.warning("Role change %r failed: %s", change, exc)
+            failures.append((change, future))
+    return failures
@@ -24,6 +24,7 @@ from django.test.utils import override_settings
 from django.utils import timezone
 from django.utils import unittest
 
+from keystoneclient.v3 import role_assignments as assignments
 from mox3.mox import IgnoreArg  # noqa
 from mox3.mox import IsA  # noqa
 
@@ -31,6 +32,7 @@ from horizon import exceptions
 from horizon.workflows import views
 
 from openstack_dashboard import api
+from openstack_dashboard.dashboards.identity.projects import membership
 from openstack_dashboard.dashboards.identity.projects import workflows
 from openstack_dashboard import policy_backend
 from openstack_dashboard.test import helpers as test
@@ -831,6 +833,19 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
 
             # member role
             workflow_data[GROUP_ROLE_PREFIX + "2"] = ['1', '2', '3']
+            # groups 1 to 3 have both roles, group 4 of another domain isn't
+            # offered by the groups step and has the admin role
+            group_roles = [('1', '1'), ('1', '2'), ('2', '1'), ('2', '2'),
+                           ('3', '1'), ('3', '2'), ('4', '1')]
+            role_assignments = [
+                assignment for assignment in role_assignments
+                if hasattr(assignment, 'user')]
+            role_assignments += [assignments.RoleAssignment(
+                assignments.RoleAssignmentManager,
+                {'group': {'id': group_id},
+                 'role': {'id': role_id},
+                 'scope': {'project': {'id': self.tenant.id}}})
+                for group_id, role_id in group_roles]
             api.keystone.role_assignments_list(IsA(http.HttpRequest),
                                                project=self.tenant.id) \
                .AndReturn(role_assignments)
@@ -850,26 +865,11 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
                                               project=self.tenant.id,
                                               user='3',
                                               role='1',)
-            api.keystone.group_list(IsA(http.HttpRequest),
-                                    domain=self.domain.id,
-                                    project=self.tenant.id) \
-                .AndReturn(groups)
-            api.keystone.roles_for_group(IsA(http.HttpRequest),
-                                         group='1',
-                                         project=self.tenant.id) \
-                .AndReturn(roles)
+            # remove role 1 from group 1, group 4 keeps its role
             api.keystone.remove_group_role(IsA(http.HttpRequest),
                                            project=self.tenant.id,
                                            group='1',
                                            role='1')
-            api.keystone.roles_for_group(IsA(http.HttpRequest),
-                                         group='2',
-                                         project=self.tenant.id) \
-                .AndReturn(roles)
-            api.keystone.roles_for_group(IsA(http.HttpRequest),
-                                         group='3',
-                                         project=self.tenant.id) \
-                .AndReturn(roles)
         else:
             api.keystone.user_list(IsA(http.HttpRequest),
                                    project=self.tenant.id) \
@@ -1559,6 +1559,39 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
                 logging.disable(logging.NOTSET)
 
 
+class MembershipTests(test.TestCase):
+    def test_diff_roles(self):
+        current = {'1': ['1', '2'], '2': ['2']}
+        requested = {'1': ['2', '3'], '3': ['1']}
+        grants, revokes = membership.diff_roles(current, requested)
+        self.assertEqual({'1': ['3'], '3': ['1']}, dict(grants))
+        self.assertEqual({'1': ['1'], '2': ['2']}, dict(revokes))
+
+    def test_diff_roles_keeps_other_actors(self):
+        # Group 2 belongs to another domain and isn't offered by the step.
+        current = {'1': ['1', '2'], '2': ['1']}
+        requested = {'1': ['2']}
+        grants, revokes = membership.diff_roles(current, requested,
+                                                actor_ids={'1', '3'})
+        self.assertEqual({}, dict(grants))
+        self.assertEqual({'1': ['1']}, dict(revokes))
+
+    def test_apply_role_changes_reports_failures(self):
+        def grant(request, user, role):
+            if role == '2':
+                raise self.exceptions.keystone
+
+        changes = membership.get_role_changes(
+            {'1': ['1', '2'], '2': ['2']}, 'grant', grant, 'user')
+        failures = membership.apply_role_changes(self.request, changes)
+
+        self.assertEqual(['1', '2'], [change.kwargs['user']
+                                      for change, future in failures])
+        for change, future in failures:
+            self.assertIsInstance(future.exception(),
+                                  type(self.exceptions.keystone))
+
+
 class UsageViewTests(test.BaseAdminViewTests):
     def _stub_nova_api_calls(self, nova_stu_enabled=True):
         self.mox.StubOutWithMock(api.nova, 'usage_get')
@@ -34,6 +34,7 @@ from openstack_dashboard.api import base
 from openstack_dashboard.api import cinder
 from openstack_dashboard.api import keystone
 from openstack_dashboard.api import nova
+from openstack_dashboard.dashboards.identity.projects import membership
 from openstack_dashboard.usage import quotas
 
 INDEX_URL = "horizon:identity:projects:index"
@@ -471,23 +472,18 @@ class CreateProject(CommonQuotaWorkflow):
         try:
             available_roles = api.keystone.role_list(request)
             member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-            # count how many users are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_to_add += len(role_list)
+            users_roles = membership.get_requested_roles(
+                data, member_step, available_roles)
             # add new users to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_added = 0
-                for user in role_list:
-                    api.keystone.add_tenant_user_role(request,
-                                                      project=project_id,
-                                                      user=user,
-                                                      role=role.id)
-                    users_added += 1
-                users_to_add -= users_added
+            changes = membership.get_role_changes(
+                users_roles, 'add_tenant_user_role',
+                api.keystone.add_tenant_user_role, 'user',
+                project=project_id)
+            failures = membership.apply_role_changes(request, changes)
+            if failures:
+                users_to_add = len(set(change.kwargs['user']
+                                       for change, future in failures))
+                failures[0][1].result()
         except Exception:
             if PROJECT_GROUP_ENABLED:
                 group_msg = _(", add project groups")
@@ -507,24 +503,17 @@ class CreateProject(CommonQuotaWorkflow):
         try:
             available_roles = api.keystone.role_list(request)
             member_step = self.get_step(PROJECT_GROUP_MEMBER_SLUG)
-
-            # count how many groups are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_to_add += len(role_list)
+            groups_roles = membership.get_requested_roles(
+                data, member_step, available_roles)
             # add new groups to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_added = 0
-                for group in role_list:
-                    api.keystone.add_group_role(request,
-                                                role=role.id,
-                                                group=group,
-                                                project=project_id)
-                    groups_added += 1
-                groups_to_add -= groups_added
+            changes = membership.get_role_changes(
+                groups_roles, 'add_group_role', api.keystone.add_group_role,
+                'group', project=project_id)
+            failures = membership.apply_role_changes(request, changes)
+            if failures:
+                groups_to_add = len(set(change.kwargs['group']
+                                        for change, future in failures))
+                failures[0][1].result()
         except Exception:
             exceptions.handle(request,
                               _('Failed to add %s project groups '
@@ -642,38 +631,12 @@ class UpdateProject(CommonQuotaWorkflow):
             exceptions.handle(request, ignore=True)
             return
 
-    def _add_roles_to_users(self, request, data, project_id, user_id,
-                            role_ids, available_roles):
-        member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-        current_role_ids = list(role_ids)
-
-        for role in available_roles:
-            field_name = member_step.get_member_field_name(role.id)
-            # Check if the user is in the list of users with this role.
-            if user_id in data[field_name]:
-                # Add it if necessary
-                if role.id not in current_role_ids:
-                    # user role has changed
-                    api.keystone.add_tenant_user_role(
-                        request,
-                        project=project_id,
-                        user=user_id,
-                        role=role.id)
-                else:
-                    # User role is unchanged, so remove it from the
-                    # remaining roles list to avoid removing it later.
-                    index = current_role_ids.index(role.id)
-                    current_role_ids.pop(index)
-        return current_role_ids
-
-    def _remove_roles_from_user(self, request, project_id, user_id,
-                                current_role_ids):
-        for id_to_delete in current_role_ids:
-            api.keystone.remove_tenant_user_role(
-                request,
-                project=project_id,
-                user=user_id,
-                role=id_to_delete)
+    @memoized.memoized_method
+    def _get_project_role_assignments(self, request, project_id):
+        # A single snapshot of the users and groups roles of the project,
+        # shared by the members and groups steps.
+        return api.keystone.get_project_role_assignments(request,
+                                                         project=project_id)
 
     def _is_removing_self_admin_role(self, request, project_id, user_id,
                                      available_roles, current_role_ids):
@@ -711,43 +674,32 @@ class UpdateProject(CommonQuotaWorkflow):
             available_roles = self._get_available_roles(request)
             # Get the users currently associated with this project so we
             # can diff against it.
-            users_roles = api.keystone.get_project_users_roles(
-                request, project=project_id)
-            users_to_modify = len(users_roles)
-
-            for user_id in users_roles.keys():
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_role_ids = list(users_roles[user_id])
-                modified_role_ids = self._add_roles_to_users(
-                    request, data, project_id, user_id,
-                    current_role_ids, available_roles)
+            users_roles, groups_roles = self._get_project_role_assignments(
+                request, project_id)
+            requested_roles = membership.get_requested_roles(
+                data, member_step, available_roles)
+            grants, revokes = membership.diff_roles(users_roles,
+                                                    requested_roles)
+            for user_id in list(revokes):
                 # Prevent admins from doing stupid things to themselves.
-                removing_admin = self._is_removing_self_admin_role(
-                    request, project_id, user_id, available_roles,
-                    modified_role_ids)
-                # Otherwise go through and revoke any removed roles.
-                if not removing_admin:
-                    self._remove_roles_from_user(request, project_id, user_id,
-                                                 modified_role_ids)
-                users_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many users may be added for exception handling.
-                users_to_modify += len(data[field_name])
-            for role in available_roles:
-                users_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for user_id in data[field_name]:
-                    if user_id not in users_roles:
-                        api.keystone.add_tenant_user_role(request,
-                                                          project=project_id,
-                                                          user=user_id,
-                                                          role=role.id)
-                    users_added += 1
-                users_to_modify -= users_added
+                if self._is_removing_self_admin_role(
+                        request, project_id, user_id, available_roles,
+                        revokes[user_id]):
+                    del revokes[user_id]
+
+            changes = membership.get_role_changes(
+                grants, 'add_tenant_user_role',
+                api.keystone.add_tenant_user_role, 'user',
+                project=project_id)
+            changes += membership.get_role_changes(
+                revokes, 'remove_tenant_user_role',
+                api.keystone.remove_tenant_user_role, 'user',
+                project=project_id)
+            failures = membership.apply_role_changes(request, changes)
+            if failures:
+                users_to_modify = len(set(change.kwargs['user']
+                                          for change, future in failures))
+                failures[0][1].result()
             return True
         except Exception:
             if PROJECT_GROUP_ENABLED:
@@ -764,7 +716,7 @@ class UpdateProject(CommonQuotaWorkflow):
         finally:
             auth_utils.remove_project_cache(request.user.token.unscoped_token)
 
-    def _update_project_groups(self, request, data, project_id, domain_id):
+    def _update_project_groups(self, request, data, project_id):
         # update project groups
         groups_to_modify = 0
         member_step = self.get_step(PROJECT_GROUP_MEMBER_SLUG)
@@ -772,63 +724,30 @@ class UpdateProject(CommonQuotaWorkflow):
             available_roles = self._get_available_roles(request)
             # Get the groups currently associated with this project so we
             # can diff against it.
-            project_groups = api.keystone.group_list(request,
-                                                     domain=domain_id,
-                                                     project=project_id)
-            groups_to_modify = len(project_groups)
-            for group in project_groups:
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_roles = api.keystone.roles_for_group(
-                    self.request,
-                    group=group.id,
-                    project=project_id)
-                current_role_ids = [role.id for role in current_roles]
-                for role in available_roles:
-                    # Check if the group is in the list of groups with
-                    # this role.
-                    field_name = member_step.get_member_field_name(role.id)
-                    if group.id in data[field_name]:
-                        # Add it if necessary
-                        if role.id not in current_role_ids:
-                            # group role has changed
-                            api.keystone.add_group_role(
-                                request,
-                                role=role.id,
-                                group=group.id,
-                                project=project_id)
-                        else:
-                            # Group role is unchanged, so remove it from
-                            # the remaining roles list to avoid removing it
-                            # later.
-                            index = current_role_ids.index(role.id)
-                            current_role_ids.pop(index)
-
-                # Revoke any removed roles.
-                for id_to_delete in current_role_ids:
-                    api.keystone.remove_group_role(request,
-                                                   role=id_to_delete,
-                                                   group=group.id,
-                                                   project=project_id)
-                groups_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many groups may be added for error handling.
-                groups_to_modify += len(data[field_name])
-            for role in available_roles:
-                groups_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for group_id in data[field_name]:
-                    if not filter(lambda x: group_id == x.id,
-                                  project_groups):
-                        api.keystone.add_group_role(request,
-                                                    role=role.id,
-                                                    group=group_id,
-                                                    project=project_id)
-                    groups_added += 1
-                groups_to_modify -= groups_added
+            users_roles, groups_roles = self._get_project_role_assignments(
+                request, project_id)
+            requested_roles = membership.get_requested_roles(
+                data, member_step, available_roles)
+            # Only the groups offered by the step, those of the project
+            # domain, are updated. The groups of other domains keep their
+            # roles.
+            group_ids = membership.get_offered_ids(member_step,
+                                                   available_roles)
+            grants, revokes = membership.diff_roles(groups_roles,
+                                                    requested_roles,
+                                                    actor_ids=group_ids)
+
+            changes = membership.get_role_changes(
+                grants, 'add_group_role', api.keystone.add_group_role,
+                'group', project=project_id)
+            changes += membership.get_role_changes(
+                revokes, 'remove_group_role', api.keystone.remove_group_role,
+                'group', project=project_id)
+            failures = membership.apply_role_changes(request, changes)
+            if failures:
+                groups_to_modify = len(set(change.kwargs['group']
+                                           for change, future in failures))
+                failures[0][1].result()
             return True
         except Exception:
             exceptions.handle(request,
@@ -859,16 +778,13 @@ class UpdateProject(CommonQuotaWorkflow):
             return False
 
         project_id = data['project_id']
-        # Use the domain_id from the project if available
-        domain_id = getattr(project, "domain_id", '')
 
         ret = self._update_project_members(request, data, project_id)
         if not ret:
             return False
 
         if PROJECT_GROUP_ENABLED:
-            ret = self._update_project_groups(request, data,
-                                              project_id, domain_id)
+            ret = self._update_project_groups(request, data, project_id)
             if not ret:
                 return False
 
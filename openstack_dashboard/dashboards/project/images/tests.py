@@ -147,6 +147,29 @@ class ImagesAndSnapshotsUtilsTests(test.TestCase):
                                image.container_format not in ('ami', 'aki'))]
         self.assertEqual(len(expected_images), len(ret))
 
+    @test.create_stubs({api.glance: ('image_list_detailed',)})
+    def test_list_image_removes_duplicates(self):
+        public_images = [image for image in self.images.list()
+                         if image.status == 'active' and image.is_public]
+        api.glance.image_list_detailed(
+            IsA(http.HttpRequest),
+            filters={'is_public': True, 'status': 'active'}) \
+            .AndReturn([public_images, False, False])
+        api.glance.image_list_detailed(
+            IsA(http.HttpRequest),
+            filters={'property-owner_id': self.tenant.id,
+                     'status': 'active'}) \
+            .AndReturn([public_images, False, False])
+
+        self.mox.ReplayAll()
+
+        ret = utils.get_available_images(self.request, self.tenant.id)
+
+        expected_images = [image for image in public_images
+                           if image.container_format not in ('aki', 'ari')]
+        self.assertEqual([image.id for image in expected_images],
+                         [image.id for image in ret])
+
     @test.create_stubs({api.glance: ('image_list_detailed',)})
     def test_list_image_using_cache(self):
         public_images = [image for image in self.images.list()
@@ -32,12 +32,9 @@ def get_available_images(request, project_id=None, images_cache=None):
     public_images = images_cache.get('public_images', [])
     images_by_project = images_cache.get('images_by_project', {})
     if 'public_images' not in images_cache:
-        public = {"is_public": True,
-                  "status": "active"}
         try:
-            images, _more, _prev = glance.image_list_detailed(
-                request, filters=public)
-            [public_images.append(image) for image in images]
+            # The list is shared across requests, don't modify it.
+            public_images = list(glance.public_image_list(request))
             images_cache['public_images'] = public_images
         except Exception:
             exceptions.handle(request,
@@ -65,17 +62,15 @@ def get_available_images(request, project_id=None, images_cache=None):
     if 'images_by_project' not in images_cache:
         images_cache['images_by_project'] = images_by_project
 
-    images = owned_images + public_images
-
-    # Remove duplicate images
-    image_ids = []
+    # Remove duplicate images and kernel and ramdisk images
+    image_ids = set()
     final_images = []
-    for image in images:
+    for image in owned_images + public_images:
         if image.id not in image_ids:
-            image_ids.append(image.id)
-            final_images.append(image)
-    return [image for image in final_images
-            if image.container_format not in ('aki', 'ari')]
+            image_ids.add(image.id)
+            if image.container_format not in ('aki', 'ari'):
+                final_images.append(image)
+    return final_images
 
 
 def image_field_data(request, include_empty_option=False):
@@ -11,18 +11,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import logging
 
+from django.core.cache import cache
 from django.utils.datastructures import SortedDict
 from django.utils.http import urlencode
 from django.utils.translation import ugettext_lazy as _
 import six
 
 from horizon import exceptions
+from horizon.utils import memoized
 
 from novaclient import exceptions as nova_exception
 
 from openstack_dashboard import api
+from openstack_dashboard.api import base
 
 LOG = logging.getLogger(__name__)
 
@@ -71,3 +75,41 @@ def get_console(request, console_type, instance):
         return (con_type, console_url)
 
     raise exceptions.NotAvailable(_('No available console found.'))
+
+
+def get_console_type(request, console_type, instances):
+    """Get the type of the console available for the given instances.
+
+    Unlike :func:`get_console`, it doesn't create a console for every
+    instance. With ``console_type`` ``AUTO`` the consoles are probed on a
+    single active instance and the type found is cached for the region, for
+    an hour by default (``console.type`` in ``MEMOIZED_TTL``). Not finding
+    any console isn't cached, as it may only be due to the probed instance.
+    The console URLs are only requested once a console is opened.
+
+    Returns ``None`` if no console is available.
+    """
+    if console_type != 'AUTO':
+        return console_type if console_type in CONSOLES else None
+
+    # Consoles are the same for the whole compute endpoint of a region.
+    try:
+        endpoint = base.url_for(request, 'compute')
+    except exceptions.ServiceCatalogException:
+        endpoint = None
+    key = 'console.type:%s' % hashlib.md5(repr(
+        (request.user.services_region, endpoint)).encode('utf-8')).hexdigest()
+    ttl = memoized.get_ttl('console.type', 3600)
+    con_type = cache.get(key) if ttl else None
+    if con_type is None:
+        active = [instance for instance in instances
+                  if instance.status == 'ACTIVE']
+        if not active:
+            return None
+        try:
+            con_type = get_console(request, console_type, active[0])[0]
+        except exceptions.NotAvailable:
+            return None
+        if ttl:
+            cache.set(key, con_type, ttl)
+    return con_type
@@ -74,7 +74,7 @@ def availability_zone_list(request):
         return []
 
 
-def network_field_data(request, include_empty_option=False):
+def network_field_data(request, include_empty_option=False, networks=None):
     """Returns a list of tuples of all networks.
 
     Generates a list of networks available to the user (request). And returns
@@ -83,16 +83,21 @@ def network_field_data(request, include_empty_option=False):
     :param request: django http request object
     :param include_empty_option: flag to include a empty tuple in the front of
     the list
+    :param networks: the networks of the user, if they have been retrieved
+    already
     :return: list of (id, name) tuples
     """
     tenant_id = request.user.tenant_id
-    networks = []
-    if api.base.is_service_enabled(request, 'network'):
+    if networks is not None:
+        networks = [(n.id, n.name_or_id) for n in networks]
+        networks.sort(key=lambda obj: obj[1])
+    elif api.base.is_service_enabled(request, 'network'):
         try:
             networks = api.neutron.network_list_for_tenant(request, tenant_id)
             networks = [(n.id, n.name_or_id) for n in networks]
             networks.sort(key=lambda obj: obj[1])
         except Exception as e:
+            networks = []
             msg = _('Failed to get network list {0}').format(six.text_type(e))
             exceptions.handle(request, msg)
 
@@ -106,7 +111,7 @@ def network_field_data(request, include_empty_option=False):
     return networks
 
 
-def keypair_field_data(request, include_empty_option=False):
+def keypair_field_data(request, include_empty_option=False, keypairs=None):
     """Returns a list of tuples of all keypairs.
 
     Generates a list of keypairs available to the user (request). And returns
@@ -115,11 +120,14 @@ def keypair_field_data(request, include_empty_option=False):
     :param request: django http request object
     :param include_empty_option: flag to include a empty tuple in the front of
     the list
+    :param keypairs: the keypairs of the user, if they have been retrieved
+    already
     :return: list of (id, name) tuples
     """
     keypair_list = []
     try:
-        keypairs = api.nova.keypair_list(request)
+        if keypairs is None:
+            keypairs = api.nova.keypair_list(request)
         keypair_list = [(kp.name, kp.name) for kp in keypairs]
     except Exception:
         exceptions.handle(request, _('Unable to retrieve key pairs.'))
@@ -134,7 +142,7 @@ def keypair_field_data(request, include_empty_option=False):
     return keypair_list
 
 
-def flavor_field_data(request, include_empty_option=False):
+def flavor_field_data(request, include_empty_option=False, flavors=None):
     """Returns a list of tuples of all image flavors.
 
     Generates a list of image flavors available. And returns a list of
@@ -143,9 +151,12 @@ def flavor_field_data(request, include_empty_option=False):
     :param request: django http request object
     :param include_empty_option: flag to include a empty tuple in the front of
     the list
+    :param flavors: the available flavors, if they have been retrieved
+    already
     :return: list of (id, name) tuples
     """
-    flavors = flavor_list(request)
+    if flavors is None:
+        flavors = flavor_list(request)
     if flavors:
         flavors_list = sort_flavor_list(request, flavors)
         if include_empty_option:
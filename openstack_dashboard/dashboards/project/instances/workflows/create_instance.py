@@ -27,6 +27,7 @@ from django.utils.text import normalize_newlines  # noqa
 from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import ungettext_lazy
 from django.views.decorators.debug import sensitive_variables  # noqa
+import six
 
 from horizon import exceptions
 from horizon import forms
@@ -50,6 +51,64 @@ from openstack_dashboard.dashboards.project.instances \
 LOG = logging.getLogger(__name__)
 
 
+def _flavor_list(request, context):
+    return api.nova.flavor_list(request)
+
+
+def _availability_zone_list(request, context):
+    return api.nova.availability_zone_list(request)
+
+
+def _images_cache(request, context):
+    # Makes the same calls as image_utils.get_available_images and returns
+    # the cache it fills.
+    project_id = context.get('project_id')
+    public = list(api.glance.public_image_list(request))
+    owned = []
+    if project_id is not None:
+        owned, _more, _prev = api.glance.image_list_detailed(
+            request, filters={"property-owner_id": project_id,
+                              "status": "active"})
+    return {'public_images': public,
+            'images_by_project': {project_id: owned}}
+
+
+def _volume_list(request, context):
+    if not base.is_service_enabled(request, 'volume'):
+        return []
+    return cinder.volume_list(
+        request, search_opts=dict(status=api.cinder.VOLUME_STATE_AVAILABLE,
+                                  bootable=1))
+
+
+def _volume_snapshot_list(request, context):
+    if not base.is_service_enabled(request, 'volume'):
+        return []
+    return cinder.volume_snapshot_list(
+        request, search_opts=dict(status=api.cinder.VOLUME_STATE_AVAILABLE))
+
+
+def _keypair_list(request, context):
+    return api.nova.keypair_list(request)
+
+
+def _security_group_list(request, context):
+    return api.network.security_group_list(request)
+
+
+def _network_list(request, context):
+    if not base.is_service_enabled(request, 'network'):
+        return []
+    return api.neutron.network_list_for_tenant(request,
+                                               request.user.tenant_id)
+
+
+def _policy_profile_list(request, context):
+    if not api.neutron.is_port_profiles_supported():
+        return []
+    return api.neutron.profile_list(request, 'policy')
+
+
 class SelectProjectUserAction(workflows.Action):
     project_id = forms.ChoiceField(label=_("Project"))
     user_id = forms.ChoiceField(label=_("User"))
@@ -138,6 +197,11 @@ class SetInstanceDetailsAction(workflows.Action):
         name = _("Details")
         help_text_template = ("project/instances/"
                               "_launch_details_help.html")
+        prefetch = {'flavors': _flavor_list,
+                    'availability_zones': _availability_zone_list,
+                    'images_cache': _images_cache,
+                    'volumes': _volume_list,
+                    'volume_snapshots': _volume_snapshot_list}
 
     def __init__(self, request, context, *args, **kwargs):
         self._init_images_cache()
@@ -370,11 +434,17 @@ class SetInstanceDetailsAction(workflows.Action):
         return cleaned_data
 
     def populate_flavor_choices(self, request, context):
-        return instance_utils.flavor_field_data(request, False)
+        try:
+            flavors = self.get_prefetched('flavors')
+        except Exception:
+            flavors = []
+            exceptions.handle(request,
+                              _('Unable to retrieve instance flavors.'))
+        return instance_utils.flavor_field_data(request, False, flavors)
 
     def populate_availability_zone_choices(self, request, context):
         try:
-            zones = api.nova.availability_zone_list(request)
+            zones = self.get_prefetched('availability_zones')
         except Exception:
             zones = []
             exceptions.handle(request,
@@ -416,6 +486,18 @@ class SetInstanceDetailsAction(workflows.Action):
         if not hasattr(self, '_images_cache'):
             self._images_cache = {}
 
+    def _get_available_images(self, request, context):
+        if not self._images_cache:
+            try:
+                self._images_cache.update(
+                    self.get_prefetched('images_cache'))
+            except Exception:
+                # Let get_available_images retry and report the failure.
+                pass
+        return image_utils.get_available_images(request,
+                                                context.get('project_id'),
+                                                self._images_cache)
+
     def _get_volume_display_name(self, volume):
         if hasattr(volume, "volume_id"):
             vol_type = "snap"
@@ -431,9 +513,7 @@ class SetInstanceDetailsAction(workflows.Action):
 
     def populate_image_id_choices(self, request, context):
         choices = []
-        images = image_utils.get_available_images(request,
-                                                  context.get('project_id'),
-                                                  self._images_cache)
+        images = self._get_available_images(request, context)
         for image in images:
             image.bytes = image.virtual_size or image.size
             image.volume_size = max(
@@ -450,9 +530,7 @@ class SetInstanceDetailsAction(workflows.Action):
         return choices
 
     def populate_instance_snapshot_id_choices(self, request, context):
-        images = image_utils.get_available_images(request,
-                                                  context.get('project_id'),
-                                                  self._images_cache)
+        images = self._get_available_images(request, context)
         choices = [(image.id, image.name)
                    for image in images
                    if image.properties.get("image_type", '') == "snapshot"]
@@ -466,11 +544,8 @@ class SetInstanceDetailsAction(workflows.Action):
     def populate_volume_id_choices(self, request, context):
         volumes = []
         try:
-            if base.is_service_enabled(request, 'volume'):
-                available = api.cinder.VOLUME_STATE_AVAILABLE
-                volumes = [self._get_volume_display_name(v)
-                           for v in cinder.volume_list(self.request,
-                           search_opts=dict(status=available, bootable=1))]
+            volumes = [self._get_volume_display_name(v)
+                       for v in self.get_prefetched('volumes')]
         except Exception:
             exceptions.handle(self.request,
                               _('Unable to retrieve list of volumes.'))
@@ -483,11 +558,8 @@ class SetInstanceDetailsAction(workflows.Action):
     def populate_volume_snapshot_id_choices(self, request, context):
         snapshots = []
         try:
-            if base.is_service_enabled(request, 'volume'):
-                available = api.cinder.VOLUME_STATE_AVAILABLE
-                snapshots = [self._get_volume_display_name(s)
-                             for s in cinder.volume_snapshot_list(
-                             self.request, search_opts=dict(status=available))]
+            snapshots = [self._get_volume_display_name(s)
+                         for s in self.get_prefetched('volume_snapshots')]
         except Exception:
             exceptions.handle(self.request,
                               _('Unable to retrieve list of volume '
@@ -562,6 +634,8 @@ class SetAccessControlsAction(workflows.Action):
         name = _("Access & Security")
         help_text = _("Control access to your instance via key pairs, "
                       "security groups, and other mechanisms.")
+        prefetch = {'keypairs': _keypair_list,
+                    'security_groups': _security_group_list}
 
     def __init__(self, request, *args, **kwargs):
         super(SetAccessControlsAction, self).__init__(request, *args, **kwargs)
@@ -570,14 +644,19 @@ class SetAccessControlsAction(workflows.Action):
             del self.fields['confirm_admin_pass']
 
     def populate_keypair_choices(self, request, context):
-        keypairs = instance_utils.keypair_field_data(request, True)
+        try:
+            keypairs = self.get_prefetched('keypairs')
+        except Exception:
+            keypairs = []
+            exceptions.handle(request, _('Unable to retrieve key pairs.'))
+        keypairs = instance_utils.keypair_field_data(request, True, keypairs)
         if len(keypairs) == 2:
             self.fields['keypair'].initial = keypairs[1][0]
         return keypairs
 
     def populate_groups_choices(self, request, context):
         try:
-            groups = api.network.security_group_list(request)
+            groups = self.get_prefetched('security_groups')
             security_group_list = [(sg.name, sg.name) for sg in groups]
         except Exception:
             exceptions.handle(request,
@@ -726,9 +805,17 @@ class SetNetworkAction(workflows.Action):
         name = _("Networking")
         permissions = ('openstack.services.network',)
         help_text = _("Select networks for your instance.")
+        prefetch = {'networks': _network_list,
+                    'policy_profiles': _policy_profile_list}
 
     def populate_network_choices(self, request, context):
-        return instance_utils.network_field_data(request)
+        try:
+            networks = self.get_prefetched('networks')
+        except Exception as e:
+            networks = []
+            msg = _('Failed to get network list {0}').format(six.text_type(e))
+            exceptions.handle(request, msg)
+        return instance_utils.network_field_data(request, networks=networks)
 
     def get_policy_profile_choices(self, request):
         profile_choices = [('', _("Select a profile"))]
@@ -739,7 +826,10 @@ class SetNetworkAction(workflows.Action):
     def _get_profiles(self, request, type_p):
         profiles = []
         try:
-            profiles = api.neutron.profile_list(request, type_p)
+            if type_p == 'policy':
+                profiles = self.get_prefetched('policy_profiles')
+            else:
+                profiles = api.neutron.profile_list(request, type_p)
         except Exception:
             msg = _('Network Profiles could not be retrieved.')
             exceptions.handle(request, msg)
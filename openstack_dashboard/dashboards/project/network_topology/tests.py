@@ -46,7 +46,17 @@ class NetworkTopologyTests(test.TestCase):
     def test_json_view_router_disabled(self):
         self._test_json_view(router_enable=False)
 
-    def _test_json_view(self, router_enable=True):
+    @django.test.utils.override_settings(CONSOLE_TYPE='VNC')
+    @test.create_stubs({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'network_list',
+                                      'router_list',
+                                      'port_list')})
+    def test_json_view_console_type(self):
+        # The console type is reported without creating any console.
+        self._test_json_view(console='vnc')
+
+    def _test_json_view(self, router_enable=True, console=None):
         api.nova.server_list(
             IsA(http.HttpRequest)).AndReturn([self.servers.list(), False])
         tenant_networks = [net for net in self.networks.list()
@@ -88,6 +98,10 @@ class NetworkTopologyTests(test.TestCase):
              'task': None,
              'url': '/project/instances/%s/' % server.id}
             for server in self.servers.list()]
+        if console:
+            for server in expect_server_urls:
+                if server['status'] == 'ACTIVE':
+                    server['console'] = console
         self.assertEqual(expect_server_urls, data['servers'])
 
         # rotuers
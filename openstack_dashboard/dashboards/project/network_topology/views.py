@@ -16,20 +16,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import json
-
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
-from django.http import HttpResponse  # noqa
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import View  # noqa
 
-from horizon import exceptions
+from horizon.utils import concurrency
 from horizon import views
 
 from openstack_dashboard import api
 from openstack_dashboard.usage import quotas
+from openstack_dashboard.utils import topology
 
 from openstack_dashboard.dashboards.project.network_topology.instances \
     import tables as instances_tables
@@ -166,21 +164,19 @@ class JSONView(View):
         except Exception:
             servers = []
         data = []
-        console_type = getattr(settings, 'CONSOLE_TYPE', 'AUTO')
-        # lowercase of the keys will be used at the end of the console URL.
+        # Only the console type is reported, the console URL is requested
+        # when the console is opened.
+        console_type = i_console.get_console_type(
+            request, getattr(settings, 'CONSOLE_TYPE', 'AUTO'), servers)
         for server in servers:
-            try:
-                console = i_console.get_console(
-                    request, console_type, server)[0].lower()
-            except exceptions.NotAvailable:
-                console = None
-
             server_data = {'name': server.name,
                            'status': server.status,
                            'task': getattr(server, 'OS-EXT-STS:task_state'),
                            'id': server.id}
-            if console:
-                server_data['console'] = console
+            # lowercase of the keys will be used at the end of the console
+            # URL.
+            if console_type and server.status == 'ACTIVE':
+                server_data['console'] = console_type.lower()
             data.append(server_data)
         self.add_resource_url('horizon:project:instances:detail', data)
         return data
@@ -291,10 +287,12 @@ class JSONView(View):
             ports.append(fake_port)
 
     def get(self, request, *args, **kwargs):
-        data = {'servers': self._get_servers(request),
-                'networks': self._get_networks(request),
-                'ports': self._get_ports(request),
-                'routers': self._get_routers(request)}
+        futures = concurrency.run_concurrently(
+            (name, getattr(self, '_get_%s' % name), (request,), {})
+            for name in ('servers', 'networks', 'ports', 'routers'))
+        data = dict((name, future.result())
+                    for name, future in futures.items())
         self._prepare_gateway_ports(data['routers'], data['ports'])
-        json_string = json.dumps(data, ensure_ascii=False)
-        return HttpResponse(json_string, content_type='text/json')
+        return topology.snapshot_response(
+            request, 'network_topology', data,
+            dict((name, 'id') for name in data), content_type='text/json')
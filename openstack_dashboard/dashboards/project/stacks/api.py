@@ -13,6 +13,7 @@
 import json
 
 from openstack_dashboard.api import heat
+from openstack_dashboard.utils import topology
 
 from openstack_dashboard.dashboards.project.stacks import mappings
 from openstack_dashboard.dashboards.project.stacks import sro
@@ -22,7 +23,7 @@ class Stack(object):
     pass
 
 
-def d3_data(request, stack_id=''):
+def d3_graph(request, stack_id=''):
     try:
         stack = heat.stack_get(request, stack_id)
     except Exception:
@@ -77,7 +78,14 @@ def d3_data(request, stack_id=''):
                 'text_x': 35,
                 'text_y': ".35em",
                 'in_progress': in_progress,
-                'info_box': sro.resource_info(resource)
+                'info_box': sro.resource_info(resource, stack.id,
+                                              request.user.tenant_id)
             }
             d3_data['nodes'].append(resource_node)
+    return d3_data
+
+
+def d3_data(request, stack_id=''):
+    d3_data = d3_graph(request, stack_id=stack_id)
+    d3_data['version'] = topology.save_snapshot(request, stack_id, d3_data)
     return json.dumps(d3_data)
@@ -10,10 +10,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import hashlib
+
+from django.core.cache import cache
 from django.template.defaultfilters import title  # noqa
 from django.template.loader import render_to_string
 
 from horizon.utils import filters
+from horizon.utils import memoized
 
 
 def stack_info(stack, stack_image):
@@ -30,7 +34,29 @@ def stack_info(stack, stack_image):
                             context)
 
 
-def resource_info(resource):
+def resource_info(resource, stack_id, tenant_id):
+    # The info box only changes along with the resource, so the renders are
+    # shared by the polls of the stack topology.
+    key_data = (tenant_id,
+                stack_id,
+                getattr(resource, 'physical_resource_id', None),
+                resource.resource_name,
+                resource.resource_type,
+                resource.resource_status,
+                resource.resource_status_reason,
+                getattr(resource, 'updated_time', None))
+    key = 'stacks.resource_info:%s' % hashlib.md5(
+        repr(key_data).encode('utf-8')).hexdigest()
+    ttl = memoized.get_ttl('stacks.resource_info', 600)
+    info = cache.get(key) if ttl else None
+    if info is None:
+        info = _render_resource_info(resource)
+        if ttl:
+            cache.set(key, info, ttl)
+    return info
+
+
+def _render_resource_info(resource):
     resource.resource_status_desc = title(
         filters.replace_underscores(resource.resource_status)
     )
@@ -18,7 +18,6 @@ import yaml
 
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
-from django.http import HttpResponse  # noqa
 from django.utils.translation import ugettext_lazy as _
 import django.views.generic
 
@@ -37,6 +36,7 @@ from openstack_dashboard.dashboards.project.stacks \
     import tables as project_tables
 from openstack_dashboard.dashboards.project.stacks \
     import tabs as project_tabs
+from openstack_dashboard.utils import topology
 
 
 LOG = logging.getLogger(__name__)
@@ -355,5 +355,7 @@ class ResourceView(tabs.TabView):
 
 class JSONView(django.views.generic.View):
     def get(self, request, stack_id=''):
-        return HttpResponse(project_api.d3_data(request, stack_id=stack_id),
-                            content_type="application/json")
+        return topology.snapshot_response(
+            request, stack_id,
+            project_api.d3_graph(request, stack_id=stack_id),
+            {'nodes': 'name'}, content_type="application/json")
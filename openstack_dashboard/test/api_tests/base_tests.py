@@ -240,6 +240,32 @@ class ApiHelperTests(test.TestCase):
         with self.assertRaises(exceptions.ServiceCatalogException):
             url = api_base.url_for(self.request, 'image')
 
+    def test_is_service_enabled(self):
+        self.assertTrue(api_base.is_service_enabled(self.request, 'compute'))
+        self.assertFalse(api_base.is_service_enabled(self.request,
+                                                     'notAnApi'))
+        self.assertFalse(api_base.is_service_enabled(self.request, 'compute',
+                                                     service_name='bogus'))
+
+        self.request.user.services_region = "bogus_value"
+        self.assertFalse(api_base.is_service_enabled(self.request,
+                                                     'compute'))
+        # The region is ignored for identity.
+        self.assertTrue(api_base.is_service_enabled(self.request,
+                                                    'identity'))
+
+    def test_service_catalog_index(self):
+        index = api_base.get_service_catalog_index(self.request)
+        self.assertIs(index, api_base.get_service_catalog_index(self.request))
+
+        self.request.user.service_catalog = [
+            service for service in self.request.user.service_catalog
+            if service['type'] != 'image']
+        index = api_base.get_service_catalog_index(self.request)
+        self.assertIsNone(index.get_service('image'))
+        with self.assertRaises(exceptions.ServiceCatalogException):
+            api_base.url_for(self.request, 'image')
+
 
 class QuotaSetTests(test.TestCase):
 
@@ -283,3 +309,23 @@ class QuotaSetTests(test.TestCase):
     def test_quotaset_add_with_wrong_type(self):
         quota_set = api_base.QuotaSet({'foo': 1, 'bar': 10})
         self.assertRaises(ValueError, quota_set.add, {'test': 7})
+
+    def test_quotaset_add_overrides_missing_limit(self):
+        quota_set = api_base.QuotaSet({'foo': None, 'bar': 10})
+        quota_set += api_base.QuotaSet({'foo': 3, 'bar': 5})
+        self.assertEqual(2, len(quota_set))
+        self.assertEqual(3, quota_set.get('foo').limit)
+        self.assertEqual(10, quota_set.get('bar').limit)
+
+    def test_quotaset_set_get_and_remove(self):
+        quota_set = api_base.QuotaSet({'foo': 1})
+        quota_set['bar'] = '10'
+        quota_set['foo'] = 2
+        self.assertEqual(['foo', 'bar'], [q.name for q in quota_set])
+        self.assertEqual(2, quota_set.get('foo').limit)
+        self.assertEqual(10, quota_set[1].limit)
+        self.assertEqual(7, quota_set.get('missing', 7).limit)
+
+        quota_set.remove('foo')
+        quota_set.remove('missing')
+        self.assertEqual(['bar'], [q.name for q in quota_set])
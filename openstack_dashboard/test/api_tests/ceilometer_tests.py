@@ -12,7 +12,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import threading
+
 from django import http
+from django.test.utils import override_settings
 
 from mox3.mox import IsA  # noqa
 
@@ -20,6 +23,15 @@ from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
 
+class FakeResource(object):
+    def __init__(self, id):
+        self.id = id
+        self.meters = {}
+
+    def set_meter(self, meter_name, value):
+        self.meters[meter_name] = value
+
+
 class CeilometerApiTests(test.APITestCase):
     def test_sample_list(self):
         samples = self.samples.list()
@@ -159,6 +171,49 @@ class CeilometerApiTests(test.APITestCase):
             self.assertIn(ret.name, names)
             names.remove(ret.name)
 
+    def test_update_resources_with_statistics_partial_results(self):
+        ceilometer_exception = self.exceptions.ceilometer
+
+        class FakeUsage(object):
+            def get_statistics(self, resource, **kwargs):
+                if resource.id == 'broken':
+                    raise ceilometer_exception
+                return {'fake': 1}
+
+        resources = [FakeResource('first'), FakeResource('broken'),
+                     FakeResource('last')]
+
+        failed = api.ceilometer.ThreadedUpdateResourceWithStatistics\
+            .process_list(FakeUsage(), resources, meter_names=['fake'])
+
+        self.assertEqual([resources[1]], failed)
+        self.assertEqual({'fake': 1}, resources[0].meters)
+        self.assertEqual({}, resources[1].meters)
+        self.assertEqual({'fake': 1}, resources[2].meters)
+
+    @override_settings(CEILOMETER_STATISTICS_CONCURRENCY={'timeout': 0.1})
+    def test_update_resource_with_statistics_timeout(self):
+        release = threading.Event()
+        finished = threading.Event()
+
+        class FakeUsage(object):
+            def get_statistics(self, resource, **kwargs):
+                release.wait(5)
+                finished.set()
+                return {'fake': 1}
+
+        resource = FakeResource('slow')
+        try:
+            failed = api.ceilometer.ThreadedUpdateResourceWithStatistics\
+                .process_list(FakeUsage(), [resource], meter_names=['fake'])
+        finally:
+            release.set()
+
+        self.assertEqual([resource], failed)
+        # The abandoned call doesn't modify the resource once it finishes.
+        self.assertTrue(finished.wait(5))
+        self.assertEqual({}, resource.meters)
+
     # TODO(lsmola) Test resource aggregates.
 
     @test.create_stubs({api.ceilometer.CeilometerUsage: ("get_user",
@@ -0,0 +1,73 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.test.utils import override_settings
+import requests
+
+from openstack_dashboard.api import connection_pool
+from openstack_dashboard.test import helpers as test
+
+
+class ConnectionPoolTests(test.TestCase):
+    def setUp(self):
+        super(ConnectionPoolTests, self).setUp()
+        connection_pool._pools.clear()
+
+    def test_sessions_share_adapter_per_host(self):
+        first = connection_pool.get_session('https://nova.example.com/v2/1')
+        second = connection_pool.get_session('https://nova.example.com:443/')
+        third = connection_pool.get_session('https://nova.example.com/v2/2')
+        self.assertIsNot(first, third)
+        self.assertIs(first.get_adapter('https://nova.example.com/v2'),
+                      third.get_adapter('https://nova.example.com/v2'))
+        # A different netloc gets its own pool.
+        self.assertIsNot(first.get_adapter('https://nova.example.com/'),
+                         second.get_adapter('https://nova.example.com:443/'))
+        stats = connection_pool.stats()
+        self.assertEqual(2, len(stats))
+
+    def test_tls_settings_are_part_of_the_key(self):
+        url = 'https://glance.example.com/'
+        session = connection_pool.get_session(url)
+        with override_settings(OPENSTACK_SSL_NO_VERIFY=True):
+            insecure = connection_pool.get_session(url)
+        self.assertIsNot(session.get_adapter(url), insecure.get_adapter(url))
+
+    @override_settings(API_CONNECTION_POOL={'idle_timeout': -1})
+    def test_idle_adapter_is_replaced(self):
+        url = 'https://cinder.example.com/'
+        first = connection_pool.get_session(url).get_adapter(url)
+        second = connection_pool.get_session(url).get_adapter(url)
+        self.assertIsNot(first, second)
+
+    def test_attach(self):
+        class FakeHTTPClient(object):
+            _session = None
+
+        client = FakeHTTPClient()
+        self.assertTrue(connection_pool.attach(client, '_session',
+                                               'http://nova.example.com'))
+        self.assertIsInstance(client._session, requests.Session)
+
+        # Clients without the attribute are left alone.
+        self.assertFalse(connection_pool.attach(object(), '_session',
+                                                'http://nova.example.com'))
+
+    def test_attach_alternative_names(self):
+        class FakeHTTPConnection(object):
+            request_session = requests.Session()
+
+        conn = FakeHTTPConnection()
+        self.assertTrue(connection_pool.attach(
+            conn, ('request_session', 'requests_session'),
+            'http://swift.example.com'))
+        self.assertIsInstance(conn.request_session, requests.Session)
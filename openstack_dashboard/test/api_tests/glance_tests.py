@@ -17,7 +17,9 @@
 #    under the License.
 
 from django.conf import settings
+from django.core.files import uploadedfile
 from django.test.utils import override_settings
+from mox3.mox import IsA  # noqa
 
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
@@ -247,3 +249,21 @@ class GlanceApiTests(test.APITestCase):
         self.mox.ReplayAll()
         image = api.glance.image_get(self.request, 'empty')
         self.assertIsNone(image.name)
+
+    def test_image_create_with_data_in_memory(self):
+        image = self.images.first()
+        data = uploadedfile.SimpleUploadedFile('image.img', b'image data')
+
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.create(name=image.name).AndReturn(image)
+        glanceclient.images.update(image.id,
+                                   data=IsA(api.glance._ProgressReader),
+                                   purge_props=False) \
+            .WithSideEffects(lambda image_id, data, **kwargs: data.read())
+        self.mox.ReplayAll()
+
+        api.glance.image_create(self.request, name=image.name, data=data)
+        self.assertEqual((data.size, data.size),
+                         api.glance.image_upload_progress(self.request,
+                                                          image.id))
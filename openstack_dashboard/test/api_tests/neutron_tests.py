@@ -38,6 +38,38 @@ class NeutronApiTests(test.APITestCase):
         for n in ret_val:
             self.assertIsInstance(n, api.neutron.Network)
 
+    def test_network_list_without_subnets(self):
+        networks = {'networks': self.api_networks.list()}
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks().AndReturn(networks)
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.network_list(self.request, expand_subnets=False)
+        for n, api_network in zip(ret_val, self.api_networks.list()):
+            self.assertIsInstance(n, api.neutron.Network)
+            self.assertEqual(api_network['subnets'], n.subnets)
+
+    def test_network_list_referenced_subnets(self):
+        api_networks = self.api_networks.list()
+        networks = {'networks': api_networks}
+        subnet_ids = sorted(set(s for n in api_networks
+                                for s in n['subnets']))
+        subnets = {'subnets': [s for s in self.api_subnets.list()
+                               if s['id'] in subnet_ids]}
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks().AndReturn(networks)
+        neutronclient.list_subnets(id=subnet_ids).AndReturn(subnets)
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.network_list(self.request,
+                                           expand_subnets='referenced')
+        for n in ret_val:
+            self.assertIsInstance(n, api.neutron.Network)
+            for subnet in n.subnets:
+                self.assertIsInstance(subnet, api.neutron.Subnet)
+
     def test_network_get(self):
         network = {'network': self.api_networks.first()}
         subnet = {'subnet': self.api_subnets.first()}
@@ -519,3 +551,25 @@ class NeutronApiTests(test.APITestCase):
             request=self.request)
         self.assertEqual(10, len(ret_val))
         self.assertEqual(port_ids, [p.id for p in ret_val])
+
+    @override_settings(OPENSTACK_NEUTRON_NETWORK={'max_uri_length': 1184})
+    def test_list_resources_with_long_filters_presplit(self):
+        # 1024 characters of the maximum URI length are reserved, which
+        # leaves room for four "id=<UUID>&" filters (40 chars each) per
+        # request, so no request exceeding the limit is sent.
+        ports = [{'id': str(uuid.uuid4()),
+                  'name': 'port%s' % i,
+                  'admin_state_up': True}
+                 for i in range(10)]
+        port_ids = [port['id'] for port in ports]
+
+        neutronclient = self.stub_neutronclient()
+        for i in range(0, 10, 4):
+            neutronclient.list_ports(id=port_ids[i:i + 4]) \
+                .AndReturn({'ports': ports[i:i + 4]})
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', port_ids,
+            request=self.request)
+        self.assertEqual(port_ids, [p.id for p in ret_val])
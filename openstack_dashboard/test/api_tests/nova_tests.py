@@ -48,6 +48,23 @@ class ServerWrapperTests(test.TestCase):
         server = api.nova.Server(self.servers.first(), self.request)
         self.assertEqual(image.name, server.image_name)
 
+    def test_image_name_resolved_once_per_request(self):
+        image = self.images.first()
+        self.mox.StubOutWithMock(api.glance, 'image_get')
+        api.glance.image_get(IsA(http.HttpRequest),
+                             image.id).AndReturn(image)
+        self.mox.ReplayAll()
+
+        servers = [api.nova.Server(self.servers.first(), self.request)
+                   for i in range(3)]
+        for server in servers:
+            server._image_batch = servers
+        self.assertEqual([image.name] * 3,
+                         [server.image_name for server in servers])
+        # The image is kept for the rest of the request.
+        server = api.nova.Server(self.servers.first(), self.request)
+        self.assertEqual(image.name, server.image_name)
+
 
 class ComputeApiTests(test.APITestCase):
 
@@ -18,6 +18,8 @@
 
 from __future__ import absolute_import
 
+from django.test.utils import override_settings
+from mox3.mox import IgnoreArg  # noqa
 from mox3.mox import IsA  # noqa
 
 from horizon import exceptions
@@ -114,8 +116,7 @@ class SwiftApiTests(test.APITestCase):
                                 limit=1001,
                                 marker=None,
                                 prefix=None,
-                                delimiter='/',
-                                full_listing=True).AndReturn([{}, objects])
+                                delimiter='/').AndReturn([{}, objects])
         self.mox.ReplayAll()
 
         (objs, more) = api.swift.swift_get_objects(self.request,
@@ -123,6 +124,46 @@ class SwiftApiTests(test.APITestCase):
         self.assertEqual(len(objects), len(objs))
         self.assertFalse(more)
 
+    def test_swift_get_objects_more(self):
+        container = self.containers.first()
+        objects = self.objects.list()
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                limit=3,
+                                marker=None,
+                                prefix=None,
+                                delimiter='/').AndReturn([{}, objects[:3]])
+        self.mox.ReplayAll()
+
+        (objs, more) = api.swift.swift_get_objects(self.request,
+                                                   container.name,
+                                                   limit=2)
+        self.assertEqual([obj.name for obj in objects[:2]],
+                         [obj.name for obj in objs])
+        self.assertTrue(more)
+
+    def test_swift_filter_objects(self):
+        container = self.containers.first()
+        objects = self.objects.list()
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                limit=1,
+                                marker=None,
+                                prefix=None,
+                                delimiter='/').AndReturn([{}, objects[:1]])
+        swift_api.get_container(container.name,
+                                limit=1,
+                                marker=objects[0].name,
+                                prefix=None,
+                                delimiter='/').AndReturn([{}, objects[1:2]])
+        self.mox.ReplayAll()
+
+        objs = api.swift.swift_filter_objects(self.request, 'two',
+                                              container.name, limit=1)
+        self.assertEqual([objects[1].name], [obj.name for obj in objs])
+
     def test_swift_get_object_with_data_non_chunked(self):
         container = self.containers.first()
         object = self.objects.first()
@@ -209,16 +250,16 @@ class SwiftApiTests(test.APITestCase):
                 self.data = obj.data
                 self.size = len(obj.data)
 
-        headers = {'X-Object-Meta-Orig-Filename': fake_name}
+        headers = {'X-Object-Meta-Orig-Filename': fake_name,
+                   'If-None-Match': '*'}
 
         swift_api = self.stub_swiftclient()
-        exc = self.exceptions.swift
-        swift_api.head_object(container.name, obj.name).AndRaise(exc)
         test_file = FakeFile()
         swift_api.put_object(container.name,
                              obj.name,
                              IsA(FakeFile),
                              content_length=test_file.size,
+                             chunk_size=api.swift.CHUNK_SIZE,
                              headers=headers)
         self.mox.ReplayAll()
 
@@ -227,6 +268,43 @@ class SwiftApiTests(test.APITestCase):
                                       obj.name,
                                       test_file)
 
+    @override_settings(SWIFT_SEGMENT_SIZE=4, SWIFT_USE_SLO=True)
+    def test_swift_upload_object_segmented(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        segment_container = '%s_segments' % container.name
+
+        class FakeFile(object):
+            name = 'fake_object.jpg'
+            size = 10
+
+        headers = {'X-Object-Meta-Orig-Filename': FakeFile.name}
+
+        swift_api = self.stub_swiftclient()
+        exc = self.exceptions.swift
+        swift_api.head_object(container.name, obj.name).AndRaise(exc)
+        swift_api.put_container(segment_container)
+        for size in (4, 4, 2):
+            swift_api.put_object(segment_container,
+                                 IgnoreArg(),
+                                 IsA(FakeFile),
+                                 content_length=size,
+                                 chunk_size=api.swift.CHUNK_SIZE) \
+                .AndReturn('etag')
+        swift_api.put_object(container.name,
+                             obj.name,
+                             IsA(str),
+                             headers=headers,
+                             query_string='multipart-manifest=put') \
+            .AndReturn('manifest-etag')
+        self.mox.ReplayAll()
+
+        response = api.swift.swift_upload_object(self.request,
+                                                 container.name,
+                                                 obj.name,
+                                                 FakeFile())
+        self.assertEqual('manifest-etag', response.etag)
+
     def test_swift_upload_duplicate_object(self):
         container = self.containers.first()
         obj = self.objects.first()
@@ -239,8 +317,14 @@ class SwiftApiTests(test.APITestCase):
                 self.size = len(obj.data)
 
         swift_api = self.stub_swiftclient()
-        swift_api.head_object(container.name, obj.name).AndReturn(obj)
         test_file = FakeFile()
+        swift_api.put_object(container.name,
+                             obj.name,
+                             IsA(FakeFile),
+                             content_length=test_file.size,
+                             chunk_size=api.swift.CHUNK_SIZE,
+                             headers=IgnoreArg()) \
+            .AndRaise(self.exceptions.swift_precondition_failed)
         self.mox.ReplayAll()
 
         with self.assertRaises(exceptions.AlreadyExists):
@@ -254,13 +338,12 @@ class SwiftApiTests(test.APITestCase):
         obj = self.objects.first()
 
         swift_api = self.stub_swiftclient()
-        exc = self.exceptions.swift
-        swift_api.head_object(container.name, obj.name).AndRaise(exc)
         swift_api.put_object(container.name,
                              obj.name,
                              None,
                              content_length=0,
-                             headers={})
+                             chunk_size=api.swift.CHUNK_SIZE,
+                             headers={'If-None-Match': '*'})
         self.mox.ReplayAll()
 
         response = api.swift.swift_upload_object(self.request,
@@ -225,3 +225,10 @@ REST_API_SETTING_2 = 'bar'
 REST_API_SECURITY = 'SECURITY'
 REST_API_REQUIRED_SETTINGS = ['REST_API_SETTING_1']
 REST_API_ADDITIONAL_SETTINGS = ['REST_API_SETTING_2']
+
+# mox expects the calls recorded for a stubbed function to be made in order,
+# so make the API calls inline instead of on concurrent worker threads.
+API_CONCURRENCY_MAX_WORKERS = 1
+
+# Don't share the results of API calls between tests through the cache.
+MEMOIZED_TTL = {'default': 0}
@@ -24,12 +24,16 @@ from troveclient import exceptions as trove_exceptions
 from openstack_dashboard.test.test_data import utils
 
 
-def create_stubbed_exception(cls, status_code=500):
+def create_stubbed_exception(cls, status_code=500, status_attr=None):
     msg = "Expected failure."
 
     def fake_init_exception(self, code=None, message=None, **kwargs):
         if code is not None:
-            if hasattr(self, 'http_status'):
+            if status_attr:
+                # The real constructor sets the status code as an instance
+                # attribute, which hasattr() can't see on the class.
+                setattr(self, status_attr, code)
+            elif hasattr(self, 'http_status'):
                 self.http_status = code
             else:
                 self.code = code
@@ -80,7 +84,10 @@ def data(TEST):
     TEST.exceptions.neutron = create_stubbed_exception(neutron_exception)
 
     swift_exception = swift_exceptions.ClientException
-    TEST.exceptions.swift = create_stubbed_exception(swift_exception)
+    TEST.exceptions.swift = create_stubbed_exception(
+        swift_exception, status_attr='http_status')
+    TEST.exceptions.swift_precondition_failed = create_stubbed_exception(
+        swift_exception, 412, status_attr='http_status')
 
     cinder_exception = cinder_exceptions.BadRequest
     TEST.exceptions.cinder = create_stubbed_exception(cinder_exception)
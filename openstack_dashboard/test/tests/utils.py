@@ -14,11 +14,18 @@
 #    under the License.
 
 import datetime
+import json
 import uuid
 
+from django.core.cache.backends import locmem
+from django import http
+import mock
+from openstack_auth import utils as auth_utils
+
 from openstack_dashboard.test import helpers as test
 from openstack_dashboard.utils import filters
 from openstack_dashboard.utils import metering
+from openstack_dashboard.utils import topology
 
 
 class UtilsFilterTests(test.TestCase):
@@ -63,3 +70,51 @@ class UtilsMeteringTests(test.TestCase):
     def test_calc_date_args_invalid(self):
         self.assertRaises(
             ValueError, metering.calc_date_args, object, object, "other")
+
+
+class UtilsTopologyTests(test.TestCase):
+
+    def setUp(self):
+        super(UtilsTopologyTests, self).setUp()
+        # Snapshots are scoped to the user and stored in the cache, use the
+        # test user and a cache of our own.
+        self.request.user = auth_utils.get_user(self.request)
+        patcher = mock.patch.object(topology, 'cache',
+                                    locmem.LocMemCache('topology', {}))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_diff(self):
+        previous = {'nodes': [{'id': 1, 'name': 'one'},
+                              {'id': 2, 'name': 'two'}]}
+        current = {'nodes': [{'id': 2, 'name': 'deux'},
+                             {'id': 3, 'name': 'three'}]}
+        delta = topology.diff(previous, current, {'nodes': 'id'})
+        self.assertEqual({'nodes': {'added': [{'id': 3, 'name': 'three'}],
+                                    'changed': [{'id': 2, 'name': 'deux'}],
+                                    'removed': [1]}},
+                         delta)
+
+    def test_snapshot_response(self):
+        previous = {'stack': 'stack', 'nodes': [{'id': 1}]}
+        current = {'stack': 'stack', 'nodes': [{'id': 1}, {'id': 2}]}
+        since = topology.save_snapshot(self.request, 'scope', previous)
+
+        self.request.GET = http.QueryDict('since=%s' % since)
+        response = topology.snapshot_response(self.request, 'scope',
+                                              current, {'nodes': 'id'})
+        version = topology.get_version(current)
+        self.assertEqual('"%s"' % version, response['ETag'])
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual({'stack': 'stack',
+                          'version': version,
+                          'since': since,
+                          'delta': {'nodes': {'added': [{'id': 2}],
+                                              'changed': [],
+                                              'removed': []}}},
+                         data)
+
+        self.request.GET = http.QueryDict('since=%s' % version)
+        response = topology.snapshot_response(self.request, 'scope',
+                                              current, {'nodes': 'id'})
+        self.assertEqual(304, response.status_code)
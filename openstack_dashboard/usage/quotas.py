@@ -17,6 +17,7 @@ import logging
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
+from horizon.utils import concurrency
 from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
@@ -137,15 +138,20 @@ class QuotaUsage(dict):
 
 def _get_quota_data(request, method_name, disabled_quotas=None,
                     tenant_id=None):
-    quotasets = []
     if not tenant_id:
         tenant_id = request.user.tenant_id
-    quotasets.append(getattr(nova, method_name)(request, tenant_id))
-    qs = base.QuotaSet()
     if disabled_quotas is None:
         disabled_quotas = get_disabled_quotas(request)
-    if 'volumes' not in disabled_quotas:
-        quotasets.append(getattr(cinder, method_name)(request, tenant_id))
+    with concurrency.RequestExecutor() as executor:
+        futures = [executor.submit('nova.%s' % method_name,
+                                   getattr(nova, method_name),
+                                   request, tenant_id)]
+        if 'volumes' not in disabled_quotas:
+            futures.append(executor.submit('cinder.%s' % method_name,
+                                           getattr(cinder, method_name),
+                                           request, tenant_id))
+    quotasets = [future.result() for future in futures]
+    qs = base.QuotaSet()
     for quota in itertools.chain(*quotasets):
         if quota.name not in disabled_quotas:
             qs[quota.name] = quota.limit
@@ -160,21 +166,26 @@ def get_default_quota_data(request, disabled_quotas=None, tenant_id=None):
 
 
 def get_tenant_quota_data(request, disabled_quotas=None, tenant_id=None):
-    qs = _get_quota_data(request,
-                         "tenant_quota_get",
-                         disabled_quotas=disabled_quotas,
-                         tenant_id=tenant_id)
-
-    # TODO(jpichon): There is no API to get the default system quotas
-    # in Neutron (cf. LP#1204956), so for now handle tenant quotas here.
-    # This should be handled in _get_quota_data() eventually.
+    with concurrency.RequestExecutor() as executor:
+        # TODO(jpichon): There is no API to get the default system quotas
+        # in Neutron (cf. LP#1204956), so for now handle tenant quotas here.
+        # This should be handled in _get_quota_data() eventually.
+        neutron_future = None
+        # Check if neutron is enabled by looking for network and router
+        if disabled_quotas and 'network' and 'router' not in disabled_quotas:
+            neutron_future = executor.submit(
+                'neutron.tenant_quota_get', neutron.tenant_quota_get,
+                request, tenant_id or request.user.tenant_id)
+        qs = _get_quota_data(request,
+                             "tenant_quota_get",
+                             disabled_quotas=disabled_quotas,
+                             tenant_id=tenant_id)
+
     if not disabled_quotas:
         return qs
 
-    # Check if neutron is enabled by looking for network and router
-    if 'network' and 'router' not in disabled_quotas:
-        tenant_id = tenant_id or request.user.tenant_id
-        neutron_quotas = neutron.tenant_quota_get(request, tenant_id)
+    if neutron_future is not None:
+        neutron_quotas = neutron_future.result()
     if 'floating_ips' in disabled_quotas:
         # Neutron with quota extension disabled
         if 'floatingip' in disabled_quotas:
@@ -195,26 +206,17 @@ def get_tenant_quota_data(request, disabled_quotas=None, tenant_id=None):
             sec_quota = neutron_quotas.get('security_group').limit
             qs.add(base.QuotaSet({'security_groups': sec_quota}))
     if 'network' in disabled_quotas:
-        for item in qs.items:
-            if item.name == 'networks':
-                qs.items.remove(item)
-                break
+        qs.remove('networks')
     else:
         net_quota = neutron_quotas.get('network').limit
         qs.add(base.QuotaSet({'networks': net_quota}))
     if 'subnet' in disabled_quotas:
-        for item in qs.items:
-            if item.name == 'subnets':
-                qs.items.remove(item)
-                break
+        qs.remove('subnets')
     else:
         net_quota = neutron_quotas.get('subnet').limit
         qs.add(base.QuotaSet({'subnets': net_quota}))
     if 'router' in disabled_quotas:
-        for item in qs.items:
-            if item.name == 'routers':
-                qs.items.remove(item)
-                break
+        qs.remove('routers')
     else:
         router_quota = neutron_quotas.get('router').limit
         qs.add(base.QuotaSet({'routers': router_quota}))
@@ -253,90 +255,107 @@ def get_disabled_quotas(request):
     return disabled_quotas
 
 
-def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
+def _get_tenant_compute_usages(request, disabled_quotas, tenant_id):
+    """Returns the compute usages as a list of ``(name, value)`` tallies."""
+    server_list_kwargs = {}
     if tenant_id:
         # determine if the user has permission to view across projects
         # there are cases where an administrator wants to check the quotas
         # on a project they are not scoped to
         all_tenants = policy.check((("compute", "compute:get_all_tenants"),),
                                    request)
-        instances, has_more = nova.server_list(
-            request, search_opts={'tenant_id': tenant_id},
-            all_tenants=all_tenants)
-    else:
-        instances, has_more = nova.server_list(request)
+        server_list_kwargs = {'search_opts': {'tenant_id': tenant_id},
+                              'all_tenants': all_tenants}
+
+    with concurrency.RequestExecutor() as executor:
+        servers_future = executor.submit('nova.server_list', nova.server_list,
+                                         request, **server_list_kwargs)
+        flavors_future = executor.submit('nova.flavor_list', nova.flavor_list,
+                                         request)
+    instances, has_more = servers_future.result()
+    flavors = dict([(f.id, f) for f in flavors_future.result()])
 
     # Fetch deleted flavors if necessary.
-    flavors = dict([(f.id, f) for f in nova.flavor_list(request)])
-    missing_flavors = [instance.flavor['id'] for instance in instances
-                       if instance.flavor['id'] not in flavors]
-    for missing in missing_flavors:
-        if missing not in flavors:
+    missing_flavors = set(instance.flavor['id'] for instance in instances
+                          if instance.flavor['id'] not in flavors)
+    if missing_flavors:
+        with concurrency.RequestExecutor() as executor:
+            futures = dict((missing, executor.submit('nova.flavor_get',
+                                                     nova.flavor_get,
+                                                     request, missing))
+                           for missing in missing_flavors)
+        for missing, future in futures.items():
             try:
-                flavors[missing] = nova.flavor_get(request, missing)
+                flavors[missing] = future.result()
             except Exception:
                 flavors[missing] = {}
                 exceptions.handle(request, ignore=True)
 
-    usages.tally('instances', len(instances))
+    tallies = [('instances', len(instances))]
 
     # Sum our usage based on the flavors of the instances.
     for flavor in [flavors[instance.flavor['id']] for instance in instances]:
-        usages.tally('cores', getattr(flavor, 'vcpus', None))
-        usages.tally('ram', getattr(flavor, 'ram', None))
+        tallies.append(('cores', getattr(flavor, 'vcpus', None)))
+        tallies.append(('ram', getattr(flavor, 'ram', None)))
 
     # Initialise the tally if no instances have been launched yet
     if len(instances) == 0:
-        usages.tally('cores', 0)
-        usages.tally('ram', 0)
+        tallies.extend([('cores', 0), ('ram', 0)])
+    return tallies
 
 
-def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
-    floating_ips = []
+def _get_tenant_floating_ips(request):
     try:
         if network.floating_ip_supported(request):
-            floating_ips = network.tenant_floating_ip_list(request)
+            return network.tenant_floating_ip_list(request)
     except Exception:
         pass
-    usages.tally('floating_ips', len(floating_ips))
+    return []
 
-    if 'security_group' not in disabled_quotas:
-        security_groups = []
-        security_groups = network.security_group_list(request)
-        usages.tally('security_groups', len(security_groups))
 
+def _get_tenant_network_usages(request, disabled_quotas, tenant_id):
+    """Returns the network usages as a list of ``(name, value)`` tallies."""
+    calls = [('floating_ips', _get_tenant_floating_ips, (request,), {})]
+    if 'security_group' not in disabled_quotas:
+        calls.append(('security_groups', network.security_group_list,
+                      (request,), {}))
     if 'network' not in disabled_quotas:
-        networks = []
-        networks = neutron.network_list(request, shared=False)
-        if tenant_id:
-            networks = filter(lambda net: net.tenant_id == tenant_id, networks)
-        usages.tally('networks', len(networks))
-
+        calls.append(('networks', neutron.network_list,
+                      (request,), {'shared': False,
+                                   'expand_subnets': False}))
     if 'subnet' not in disabled_quotas:
-        subnets = []
-        subnets = neutron.subnet_list(request)
-        usages.tally('subnets', len(subnets))
-
+        calls.append(('subnets', neutron.subnet_list, (request,), {}))
     if 'router' not in disabled_quotas:
-        routers = []
-        routers = neutron.router_list(request)
-        if tenant_id:
-            routers = filter(lambda rou: rou.tenant_id == tenant_id, routers)
-        usages.tally('routers', len(routers))
-
-
-def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
-    if 'volumes' not in disabled_quotas:
-        if tenant_id:
-            opts = {'all_tenants': 1, 'project_id': tenant_id}
-            volumes = cinder.volume_list(request, opts)
-            snapshots = cinder.volume_snapshot_list(request, opts)
-        else:
-            volumes = cinder.volume_list(request)
-            snapshots = cinder.volume_snapshot_list(request)
-        usages.tally('gigabytes', sum([int(v.size) for v in volumes]))
-        usages.tally('volumes', len(volumes))
-        usages.tally('snapshots', len(snapshots))
+        calls.append(('routers', neutron.router_list, (request,), {}))
+    futures = concurrency.run_concurrently(calls)
+
+    tallies = []
+    for name, func, args, kwargs in calls:
+        resources = futures[name].result()
+        if tenant_id and name in ('networks', 'routers'):
+            resources = [resource for resource in resources
+                         if resource.tenant_id == tenant_id]
+        tallies.append((name, len(resources)))
+    return tallies
+
+
+def _get_tenant_volume_usages(request, disabled_quotas, tenant_id):
+    """Returns the volume usages as a list of ``(name, value)`` tallies."""
+    if 'volumes' in disabled_quotas:
+        return []
+    args = (request,)
+    if tenant_id:
+        args += ({'all_tenants': 1, 'project_id': tenant_id},)
+    with concurrency.RequestExecutor() as executor:
+        volumes_future = executor.submit('cinder.volume_list',
+                                         cinder.volume_list, *args)
+        snapshots_future = executor.submit('cinder.volume_snapshot_list',
+                                           cinder.volume_snapshot_list, *args)
+    volumes = volumes_future.result()
+    snapshots = snapshots_future.result()
+    return [('gigabytes', sum([int(v.size) for v in volumes])),
+            ('volumes', len(volumes)),
+            ('snapshots', len(snapshots))]
 
 
 @memoized
@@ -344,6 +363,9 @@ def tenant_quota_usages(request, tenant_id=None):
     """Get our quotas and construct our usage object.
     If no tenant_id is provided, a the request.user.project_id
     is assumed to be used
+
+    The quota limits and the compute, network and volume usages are
+    independent of each other, so they are all fetched concurrently.
     """
     if not tenant_id:
         tenant_id = request.user.project_id
@@ -351,15 +373,25 @@ def tenant_quota_usages(request, tenant_id=None):
     disabled_quotas = get_disabled_quotas(request)
     usages = QuotaUsage()
 
-    for quota in get_tenant_quota_data(request,
-                                       disabled_quotas=disabled_quotas,
-                                       tenant_id=tenant_id):
+    with concurrency.RequestExecutor() as executor:
+        quotas_future = executor.submit('quota_data', get_tenant_quota_data,
+                                        request,
+                                        disabled_quotas=disabled_quotas,
+                                        tenant_id=tenant_id)
+        usage_futures = [executor.submit(name, func, request,
+                                         disabled_quotas, tenant_id)
+                         for name, func in (
+                             ('compute_usages', _get_tenant_compute_usages),
+                             ('network_usages', _get_tenant_network_usages),
+                             ('volume_usages', _get_tenant_volume_usages))]
+
+    for quota in quotas_future.result():
         usages.add_quota(quota)
 
     # Get our usages.
-    _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id)
+    for future in usage_futures:
+        for name, value in future.result():
+            usages.tally(name, value)
 
     return usages
 
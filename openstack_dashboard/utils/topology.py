@@ -0,0 +1,113 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Versioned snapshots of the topology graphs polled by the browser.
+
+Every snapshot gets a version, a hash of its content, which is sent as its
+``ETag``. The browser passes the version of the snapshot it has as the
+``since`` query parameter of the next poll, and receives either a
+``304 Not Modified`` response when nothing changed, or only the items which
+were added, changed or removed since that version. The full snapshot is
+returned when the previous one isn't in the cache anymore.
+"""
+
+import hashlib
+import json
+
+from django.core.cache import cache
+from django import http
+
+
+SNAPSHOT_TIMEOUT = 600
+
+
+def get_version(data):
+    """Returns the version of a snapshot."""
+    return hashlib.md5(
+        json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _snapshot_key(request, scope, version):
+    key_data = (request.user.id, request.user.tenant_id, scope, version)
+    return 'topology:%s' % hashlib.md5(
+        repr(key_data).encode('utf-8')).hexdigest()
+
+
+def save_snapshot(request, scope, data):
+    """Stores a snapshot so that later polls can be answered with deltas.
+
+    ``scope`` identifies the graph, e.g. the id of a stack. Returns the
+    version of the snapshot.
+    """
+    version = get_version(data)
+    cache.set(_snapshot_key(request, scope, version), data, SNAPSHOT_TIMEOUT)
+    return version
+
+
+def diff(previous, current, collections):
+    """Returns the changes between two snapshots.
+
+    ``collections`` maps the names of the lists of items of the snapshots
+    to the key identifying their items. For every list, the result has the
+    ``added`` and ``changed`` items and the keys of the ``removed`` ones.
+    """
+    delta = {}
+    for name, key in collections.items():
+        old_items = dict((item[key], item)
+                         for item in previous.get(name, []))
+        current_keys = set()
+        added = []
+        changed = []
+        for item in current.get(name, []):
+            current_keys.add(item[key])
+            old_item = old_items.get(item[key])
+            if old_item is None:
+                added.append(item)
+            elif old_item != item:
+                changed.append(item)
+        removed = [item_key for item_key in old_items
+                   if item_key not in current_keys]
+        delta[name] = {'added': added, 'changed': changed, 'removed': removed}
+    return delta
+
+
+def snapshot_response(request, scope, data, collections,
+                      content_type='application/json'):
+    """Returns the response to a poll of the snapshot ``data``.
+
+    The lists named in ``collections`` are replaced by their ``delta``
+    when the request has the ``since`` parameter and that version of the
+    snapshot is still known. The other values of ``data`` are always sent
+    as they are.
+    """
+    version = save_snapshot(request, scope, data)
+    etag = '"%s"' % version
+    since = request.GET.get('since')
+    if (request.META.get('HTTP_IF_NONE_MATCH') == etag or
+            since == version):
+        response = http.HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    body = dict(data, version=version)
+    previous = None
+    if since:
+        previous = cache.get(_snapshot_key(request, scope, since))
+    if previous is not None:
+        body = dict((name, value) for name, value in data.items()
+                    if name not in collections)
+        body.update(version=version, since=since,
+                    delta=diff(previous, data, collections))
+    response = http.HttpResponse(json.dumps(body, ensure_ascii=False),
+                                 content_type=content_type)
+    response['ETag'] = etag
+    return response